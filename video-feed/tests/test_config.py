@@ -0,0 +1,57 @@
+"""Tests for configuration loading."""
+
+import os
+
+import pytest
+import yaml
+
+from videofeed.config import CONFIG_CACHE_SUFFIX, SurveillanceConfig, load_yaml_cached
+
+
+@pytest.mark.unit
+def test_load_yaml_cached_writes_and_reuses_cache(temp_dir, sample_config):
+    """Parsed config is cached next to the YAML file and reused."""
+    config_file = temp_dir / "surveillance.yml"
+    config_file.write_text(yaml.safe_dump(sample_config))
+
+    assert load_yaml_cached(config_file) == sample_config
+    cache_file = temp_dir / ("surveillance.yml" + CONFIG_CACHE_SUFFIX)
+    assert cache_file.exists()
+
+    # A fresh cache is returned as-is
+    assert load_yaml_cached(config_file) == sample_config
+
+
+@pytest.mark.unit
+def test_load_yaml_cached_invalidates_on_edit(temp_dir, sample_config):
+    """Editing the YAML file invalidates the cache, however new the cache file is."""
+    config_file = temp_dir / "surveillance.yml"
+    config_file.write_text(yaml.safe_dump(sample_config))
+    load_yaml_cached(config_file)
+
+    # Same-size edit; only the YAML file's mtime tells the versions apart
+    sample_config['detection']['confidence'] = 0.9
+    stat = config_file.stat()
+    config_file.write_text(yaml.safe_dump(sample_config))
+    os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    cache_file = temp_dir / ("surveillance.yml" + CONFIG_CACHE_SUFFIX)
+    future = stat.st_mtime + 10
+    os.utime(cache_file, (future, future))
+
+    config = SurveillanceConfig(config_file)
+    assert config.get_detection_confidence() == 0.9
+
+
+@pytest.mark.unit
+def test_load_yaml_cached_invalidates_on_size_with_same_mtime(temp_dir, sample_config):
+    """A rewrite within the filesystem's mtime granularity is caught by the size."""
+    config_file = temp_dir / "surveillance.yml"
+    config_file.write_text(yaml.safe_dump(sample_config))
+    load_yaml_cached(config_file)
+
+    stat = config_file.stat()
+    sample_config['detection']['model'] = "a-much-longer-model-name.pt"
+    config_file.write_text(yaml.safe_dump(sample_config))
+    os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert load_yaml_cached(config_file) == sample_config
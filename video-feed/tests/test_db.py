@@ -1,8 +1,13 @@
 #!/usr/bin/env python3
+import json
 import os
 import sqlite3
 import sys
 
+import pytest
+
+from videofeed.api import RecordingsAPI
+
 def check_db(path):
     """Check if a SQLite database exists and is accessible."""
     expanded_path = os.path.expanduser(path)
@@ -38,6 +43,117 @@ def check_db(path):
         print(f"ERROR: Failed to access database: {e}")
         return False
 
+RECORDINGS_SCHEMA = '''
+CREATE TABLE recordings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp DATETIME NOT NULL,
+    stream_id TEXT NOT NULL,
+    stream_name TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    duration REAL NOT NULL,
+    objects_detected TEXT NOT NULL,
+    thumbnail_path TEXT,
+    confidence REAL NOT NULL,
+    retained BOOLEAN DEFAULT 1
+)
+'''
+
+# (timestamp, stream_id, objects, confidence, duration, retained)
+SAMPLE_RECORDINGS = [
+    ("2025-01-01T08:00:00", "cam-1", ["person"], 0.55, 12.0, 1),
+    ("2025-01-02T09:00:00", "cam-1", ["car", "person"], 0.80, 30.0, 1),
+    ("2025-01-03T10:00:00", "cam-2", ["car"], 0.65, 5.0, 1),
+    ("2025-01-04T11:00:00", "cam-2", ["dog"], 0.95, 20.0, 1),
+    ("2025-01-05T12:00:00", "cam-1", ["person"], 0.90, 8.0, 0),  # Cleaned up
+]
+
+
+@pytest.fixture
+def recordings_api(test_db_path):
+    """RecordingsAPI over a database holding SAMPLE_RECORDINGS."""
+    conn = sqlite3.connect(test_db_path)
+    conn.execute(RECORDINGS_SCHEMA)
+    conn.executemany(
+        '''INSERT INTO recordings (timestamp, stream_id, stream_name, file_path, duration,
+           objects_detected, thumbnail_path, confidence, retained)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+        [
+            (ts, stream, stream.upper(), f"/rec/{i}.mp4", duration,
+             json.dumps([{"class": name, "confidence": conf} for name in objects]),
+             f"/rec/{i}_thumb.jpg", conf, retained)
+            for i, (ts, stream, objects, conf, duration, retained) in enumerate(SAMPLE_RECORDINGS)
+        ]
+    )
+    conn.commit()
+    conn.close()
+    
+    api = RecordingsAPI(db_path=test_db_path)
+    yield api
+    api.close()
+
+
+def _timestamps(recordings):
+    return [recording["timestamp"] for recording in recordings]
+
+
+@pytest.mark.db
+def test_get_recordings_returns_plain_dicts(recordings_api):
+    """Rows come back as dicts of every column, with objects parsed from JSON."""
+    recordings = recordings_api.get_recordings(stream_id="cam-2", sort_order="asc")
+    
+    assert [type(recording) for recording in recordings] == [dict, dict]
+    assert recordings[0] == {
+        "id": 3,
+        "timestamp": "2025-01-03T10:00:00",
+        "stream_id": "cam-2",
+        "stream_name": "CAM-2",
+        "file_path": "/rec/2.mp4",
+        "duration": 5.0,
+        "objects_detected": [{"class": "car", "confidence": 0.65}],
+        "thumbnail_path": "/rec/2_thumb.jpg",
+        "confidence": 0.65,
+        "retained": 1,
+    }
+
+
+@pytest.mark.db
+@pytest.mark.parametrize("filters, expected", [
+    ({}, ["2025-01-04T11:00:00", "2025-01-03T10:00:00", "2025-01-02T09:00:00", "2025-01-01T08:00:00"]),
+    ({"stream_id": "cam-1"}, ["2025-01-02T09:00:00", "2025-01-01T08:00:00"]),
+    ({"start_date": "2025-01-02T00:00:00"}, ["2025-01-04T11:00:00", "2025-01-03T10:00:00", "2025-01-02T09:00:00"]),
+    ({"end_date": "2025-01-02T23:59:59"}, ["2025-01-02T09:00:00", "2025-01-01T08:00:00"]),
+    ({"object_type": "car"}, ["2025-01-03T10:00:00", "2025-01-02T09:00:00"]),
+    ({"min_confidence": 0.8}, ["2025-01-04T11:00:00", "2025-01-02T09:00:00"]),
+    ({"min_confidence": 0.0}, ["2025-01-04T11:00:00", "2025-01-03T10:00:00", "2025-01-02T09:00:00", "2025-01-01T08:00:00"]),
+    ({"stream_id": "cam-1", "object_type": "person", "start_date": "2025-01-02T00:00:00"}, ["2025-01-02T09:00:00"]),
+    ({"stream_id": "cam-2", "start_date": "2025-01-01T00:00:00", "end_date": "2025-01-03T23:59:59",
+      "min_confidence": 0.6}, ["2025-01-03T10:00:00"]),
+    ({"stream_id": "cam-3"}, []),
+])
+def test_recording_filters(recordings_api, filters, expected):
+    """Each filter, alone and combined, selects the same rows for listing and counting."""
+    assert _timestamps(recordings_api.get_recordings(**filters)) == expected
+    assert recordings_api.get_recordings_count(**filters) == len(expected)
+
+
+@pytest.mark.db
+def test_recording_pagination_and_sorting(recordings_api):
+    """Pages follow the requested order; invalid sort options fall back to newest first."""
+    pages = [
+        _timestamps(recordings_api.get_recordings(limit=3, offset=offset, sort_by="confidence", sort_order="asc"))
+        for offset in (0, 3, 6)
+    ]
+    assert pages == [
+        ["2025-01-01T08:00:00", "2025-01-03T10:00:00", "2025-01-02T09:00:00"],
+        ["2025-01-04T11:00:00"],
+        [],
+    ]
+    
+    assert _timestamps(recordings_api.get_recordings(limit=2, sort_by="bogus", sort_order="sideways")) == [
+        "2025-01-04T11:00:00", "2025-01-03T10:00:00"
+    ]
+
+
 if __name__ == "__main__":
     db_path = "~/video-feed-recordings/recordings.db"
     if len(sys.argv) > 1:
@@ -0,0 +1,114 @@
+"""Tests for ETag / If-None-Match handling on frame and status endpoints."""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import videofeed.routes.video as video_routes
+import videofeed.visualizer as visualizer
+
+
+class FakeDetector:
+    """Detector stand-in exposing what the HTTP layer reads."""
+
+    def __init__(self):
+        self.detector_id = "det-1"
+        self.frames_processed = 1
+        self.views = 0
+
+    def mark_viewed(self):
+        self.views += 1
+
+
+class FakeManager:
+    """DetectorManager stand-in with a single detector."""
+
+    def __init__(self):
+        self.detector = FakeDetector()
+        self.default_detector_id = self.detector.detector_id
+        self.version = 0
+        self.status = {"fps": 10}
+
+    def get_detector(self, detector_id=None):
+        if detector_id in (None, self.detector.detector_id):
+            return self.detector
+        return None
+
+    def get_all_detectors(self):
+        return {self.detector.detector_id: self.detector}
+
+    def get_frame_jpeg(self, detector_id=None):
+        return b"jpeg-%d" % self.detector.frames_processed
+
+    def get_detector_status(self, detector_id=None):
+        return dict(self.status)
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    manager = FakeManager()
+    monkeypatch.setattr(video_routes, "detector_manager", manager)
+    monkeypatch.setattr(visualizer, "detector_manager", manager)
+    visualizer._status_cache.clear()
+    yield manager
+    visualizer._status_cache.clear()
+
+
+@pytest.fixture
+def video_client(manager):
+    app = FastAPI()
+    app.include_router(video_routes.router)
+    return TestClient(app)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("path", ["/video/snapshot", "/video/jpeg/det-1"])
+def test_frame_not_modified_while_frame_unchanged(video_client, manager, path):
+    """A matching If-None-Match gets an empty 304 and still counts as a view."""
+    first = video_client.get(path)
+    assert first.status_code == 200
+    assert first.content == b"jpeg-1"
+    etag = first.headers["etag"]
+    assert etag == '"det-1-1"'
+
+    cached = video_client.get(path, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+    assert manager.detector.views == 1
+
+
+@pytest.mark.unit
+def test_frame_etag_changes_with_new_frame(video_client, manager):
+    """Once another frame is processed, the old ETag gets the new frame."""
+    etag = video_client.get("/video/snapshot").headers["etag"]
+    manager.detector.frames_processed += 1
+
+    fresh = video_client.get("/video/snapshot", headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.content == b"jpeg-2"
+    assert fresh.headers["etag"] == '"det-1-2"'
+    assert manager.detector.views == 0
+
+
+@pytest.mark.unit
+def test_status_not_modified_until_status_changes(manager, monkeypatch):
+    """/status answers 304 for the current ETag and a new ETag after a change."""
+    monkeypatch.setattr(visualizer, "STATUS_INTERVAL", 0.0)
+    client = TestClient(visualizer.app)
+
+    first = client.get("/status")
+    assert first.status_code == 200
+    assert first.json() == {"fps": 10}
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"')
+
+    cached = client.get("/status", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    manager.status["fps"] = 12
+    fresh = client.get("/status", headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.json() == {"fps": 12}
+    assert fresh.headers["etag"] != etag
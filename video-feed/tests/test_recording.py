@@ -6,9 +6,12 @@ This script helps verify that the recording system is working correctly.
 
 import os
 import sys
+import threading
 import time
 from pathlib import Path
 
+import pytest
+
 # Add the video-feed directory to the path
 sys.path.insert(0, str(Path(__file__).parent / "video-feed"))
 
@@ -153,6 +156,150 @@ def test_recording_system(filter_objects=False):
         recorder.stop()
         print("🛑 Recording manager stopped")
 
+class _ListWriter:
+    """Stand-in for cv2.VideoWriter that keeps the written frames."""
+    
+    def __init__(self):
+        self.frames = []
+        
+    def isOpened(self):
+        return True
+    
+    def write(self, frame):
+        self.frames.append(frame)
+        
+    def release(self):
+        pass
+
+
+PERSON = [{"class": "person", "confidence": 0.9, "bbox": [0, 0, 10, 10]}]
+
+
+def _wait_for(condition, timeout=5.0):
+    """Poll until condition() is true or the timeout passes."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return condition()
+
+
+@pytest.mark.recording
+def test_watchdog_finalizes_after_post_buffer(test_recordings_dir):
+    """A recording is extended by detections and finalized by the watchdog."""
+    recorder = RecordingManager(
+        recordings_dir=test_recordings_dir,
+        pre_detection_buffer=1,
+        post_detection_buffer=0.3,
+        min_confidence=0.3,
+        target_fps=10,
+        hw_encode=False
+    )
+    recorder.start()
+    try:
+        recorder.register_stream("cam", "cam")
+        for i in range(5):
+            recorder.add_frame("cam", create_test_frame(64, 48, frame_num=i))
+        
+        recorder.handle_detection("cam", PERSON, 0.9, create_test_frame(64, 48))
+        assert len(recorder.active_recordings) == 1
+        recording = next(iter(recorder.active_recordings.values()))
+        started = recording['last_detection_time']
+        
+        # Detections within the post-detection buffer keep it open
+        for i in range(4):
+            time.sleep(0.15)
+            recorder.add_frame("cam", create_test_frame(64, 48, frame_num=10 + i))
+            recorder.handle_detection("cam", PERSON, 0.9, create_test_frame(64, 48))
+        assert len(recorder.active_recordings) == 1
+        assert recording['last_detection_time'] > started
+        
+        # Without detections the watchdog closes it
+        assert _wait_for(lambda: not recorder.active_recordings)
+        assert not recorder.frame_buffers["cam"]['recording_in_progress']
+        assert recorder.frame_buffers["cam"]['recording_id'] is None
+        assert os.path.exists(recording['file_path'])
+        
+        rows = recorder.db_conn.execute('SELECT stream_id, duration FROM recordings').fetchall()
+        assert len(rows) == 1
+        assert rows[0][0] == "cam"
+        assert rows[0][1] >= 0.6
+    finally:
+        recorder.stop()
+
+
+@pytest.mark.recording
+def test_watchdog_finalize_rechecks_cooldown(test_recordings_dir):
+    """A recording extended after the watchdog picked it up stays open."""
+    recorder = RecordingManager(
+        recordings_dir=test_recordings_dir,
+        post_detection_buffer=1,
+        min_confidence=0.3,
+        hw_encode=False
+    )
+    recorder._open_writer = lambda path, fps, size: _ListWriter()
+    try:
+        recorder.register_stream("cam", "cam")
+        recorder.handle_detection("cam", PERSON, 0.9, create_test_frame(16, 16))
+        recording_id, recording = next(iter(recorder.active_recordings.items()))
+        
+        # Expired when the watchdog looked, then extended before it finalized
+        recording['last_detection_time'] -= 5
+        recorder.handle_detection("cam", PERSON, 0.9, create_test_frame(16, 16))
+        recorder._finalize_recording(recording_id, expired_only=True)
+        assert recording_id in recorder.active_recordings
+        
+        recording['last_detection_time'] -= 5
+        recorder._finalize_recording(recording_id, expired_only=True)
+        assert recording_id not in recorder.active_recordings
+        assert not recorder.frame_buffers["cam"]['recording_in_progress']
+    finally:
+        recorder.stop()
+
+
+@pytest.mark.recording
+def test_add_frame_racing_detection_writes_each_frame_once(test_recordings_dir):
+    """Frames added while a recording starts are written once, in order, without gaps."""
+    recorder = RecordingManager(
+        recordings_dir=test_recordings_dir,
+        pre_detection_buffer=100,
+        post_detection_buffer=60,
+        min_confidence=0.3,
+        target_fps=100,
+        hw_encode=False
+    )
+    writers = []
+    
+    def open_writer(path, fps, size):
+        writers.append(_ListWriter())
+        return writers[-1]
+    recorder._open_writer = open_writer
+    
+    base = time.time()
+    for n in range(5):
+        stream_id = f"cam-{n}"
+        recorder.register_stream(stream_id, stream_id)
+        frames = [create_test_frame(16, 16) for _ in range(400)]
+        index = {id(frame): i for i, frame in enumerate(frames)}
+        
+        def feed():
+            for i, frame in enumerate(frames):
+                recorder.add_frame(stream_id, frame, timestamp=base + n + i * 0.001)
+        
+        feeder = threading.Thread(target=feed)
+        feeder.start()
+        time.sleep(0.002)
+        detection_frame = create_test_frame(16, 16)
+        recorder.handle_detection(stream_id, PERSON, 0.9, detection_frame)
+        feeder.join()
+        
+        # The buffer holds every frame, so the replay starts at the first one
+        written = [index[id(frame)] for frame in writers[-1].frames if frame is not detection_frame]
+        assert written == list(range(len(frames)))
+    
+    recorder.stop()
+
 def test_with_object_filtering():
     """Test recording with object filtering."""
     print("\n\n🧪 Testing Recording System WITH Object Filtering")
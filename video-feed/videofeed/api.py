@@ -4,7 +4,8 @@ import os
 import json
 import logging
 import sqlite3
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 
 # Configure logging
@@ -12,6 +13,42 @@ logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger('video-recorder-api')
 
+
+@lru_cache(maxsize=None)
+def _filter_sql(has_stream: bool, has_start: bool, has_end: bool,
+                has_object: bool, has_confidence: bool) -> str:
+    """Build the WHERE clause for a combination of recording filters.
+    
+    The text depends only on which filters are set, so repeated requests
+    reuse the same SQL and hit sqlite3's compiled statement cache.
+    """
+    clauses = ['retained = 1']
+    if has_stream:
+        clauses.append('stream_id = ?')
+    if has_start:
+        clauses.append('timestamp >= ?')
+    if has_end:
+        clauses.append('timestamp <= ?')
+    if has_object:
+        clauses.append('objects_detected LIKE ?')
+    if has_confidence:
+        clauses.append('confidence >= ?')
+    return ' AND '.join(clauses)
+
+
+def _recordings_filter(stream_id: Optional[str], start_date: Optional[str], end_date: Optional[str],
+                       object_type: Optional[str], min_confidence: Optional[float]) -> Tuple[str, list]:
+    """Return the WHERE clause and parameters for the recording filters."""
+    where = _filter_sql(bool(stream_id), bool(start_date), bool(end_date),
+                        bool(object_type), min_confidence is not None)
+    params = [value for value in (stream_id, start_date, end_date) if value]
+    if object_type:
+        params.append(f'%"{object_type}"%')
+    if min_confidence is not None:
+        params.append(min_confidence)
+    return where, params
+
+
 class RecordingsAPI:
     """API for accessing and managing surveillance recordings database."""
     
@@ -37,7 +74,11 @@ class RecordingsAPI:
     def _init_connection(self):
         """Initialize database connection."""
         try:
-            self.db_conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            # The recorder writes to the same file; wait for its locks
+            self.db_conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30.0)
+            # Read-mostly: memory-mapped page reads, temp B-trees in memory
+            self.db_conn.execute('PRAGMA mmap_size=268435456')
+            self.db_conn.execute('PRAGMA temp_store=MEMORY')
             logger.info(f"Connected to database: {self.db_path}")
         except Exception as e:
             logger.error(f"Database connection failed: {e}")
@@ -75,30 +116,8 @@ class RecordingsAPI:
         Returns:
             List of recording information dictionaries
         """
-        query = 'SELECT * FROM recordings WHERE retained = 1'
-        params = []
-        
-        if stream_id:
-            query += ' AND stream_id = ?'
-            params.append(stream_id)
-            
-        if start_date:
-            query += ' AND timestamp >= ?'
-            params.append(start_date)
-            
-        if end_date:
-            query += ' AND timestamp <= ?'
-            params.append(end_date)
-        
-        # Filter by object type if specified
-        if object_type:
-            query += " AND objects_detected LIKE ? "
-            params.append(f'%"{object_type}"%')
-        
-        # Filter by minimum confidence if specified
-        if min_confidence is not None:
-            query += " AND confidence >= ? "
-            params.append(min_confidence)
+        where, params = _recordings_filter(stream_id, start_date, end_date, object_type, min_confidence)
+        query = 'SELECT * FROM recordings WHERE ' + where
         
         # Handle sorting (with SQL injection protection by validating in the FastAPI endpoint)
         if sort_order.lower() not in ('asc', 'desc'):
@@ -120,13 +139,13 @@ class RecordingsAPI:
         
         try:
             cursor = self.db_conn.cursor()
+            cursor.row_factory = sqlite3.Row
             cursor.execute(query, params)
             
-            columns = [col[0] for col in cursor.description]
             recordings = []
             
-            for row in cursor.fetchall():
-                recording = dict(zip(columns, row))
+            for row in cursor:
+                recording = dict(row)
                 
                 # Parse JSON fields
                 recording['objects_detected'] = json.loads(recording['objects_detected'])
@@ -156,30 +175,8 @@ class RecordingsAPI:
         Returns:
             Total count of matching recordings
         """
-        query = 'SELECT COUNT(*) FROM recordings WHERE retained = 1'
-        params = []
-        
-        if stream_id:
-            query += ' AND stream_id = ?'
-            params.append(stream_id)
-            
-        if start_date:
-            query += ' AND timestamp >= ?'
-            params.append(start_date)
-            
-        if end_date:
-            query += ' AND timestamp <= ?'
-            params.append(end_date)
-        
-        # Filter by object type if specified
-        if object_type:
-            query += " AND objects_detected LIKE ? "
-            params.append(f'%"{object_type}"%')
-        
-        # Filter by minimum confidence if specified
-        if min_confidence is not None:
-            query += " AND confidence >= ? "
-            params.append(min_confidence)
+        where, params = _recordings_filter(stream_id, start_date, end_date, object_type, min_confidence)
+        query = 'SELECT COUNT(*) FROM recordings WHERE ' + where
         
         try:
             cursor = self.db_conn.cursor()
@@ -201,14 +198,14 @@ class RecordingsAPI:
         """
         try:
             cursor = self.db_conn.cursor()
+            cursor.row_factory = sqlite3.Row
             cursor.execute('SELECT * FROM recordings WHERE id = ? AND retained = 1', (recording_id,))
             result = cursor.fetchone()
             
             if not result:
                 return None
                 
-            columns = [col[0] for col in cursor.description]
-            recording = dict(zip(columns, result))
+            recording = dict(result)
             
             # Parse JSON fields
             recording['objects_detected'] = json.loads(recording['objects_detected'])
@@ -298,13 +295,13 @@ class RecordingsAPI:
             query += ' ORDER BY timestamp DESC LIMIT ? OFFSET ?'
             params.extend([limit, offset])
             
+            cursor.row_factory = sqlite3.Row
             cursor.execute(query, params)
             
-            columns = [col[0] for col in cursor.description]
             alerts = []
             
-            for row in cursor.fetchall():
-                alert = dict(zip(columns, row))
+            for row in cursor:
+                alert = dict(row)
                 
                 # Parse JSON objects
                 alert['objects_detected'] = json.loads(alert['objects_detected'])
@@ -9,7 +9,6 @@ Usage:
     python -m videofeed.surveillance reset    # Instead of: python -m videofeed.cli reset
 """
 
-import typer
 import warnings
 
 # Import the new unified app
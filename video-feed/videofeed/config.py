@@ -1,13 +1,120 @@
 """Configuration management for video-feed."""
 
+import json
 import os
+import tempfile
 import yaml
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 import typer
 
 from .constants import DEFAULT_PATHS
 
+# Optional Rust-based YAML parser; falls back to PyYAML's libyaml bindings
+try:
+    import ryaml
+except ImportError:
+    ryaml = None
+
+# Optional fast binary format for the parsed-config sidecar cache
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_SafeDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+def load_yaml(path: Path) -> Any:
+    """Parse a YAML file with the fastest available parser.
+
+    Tries ryaml first, then PyYAML's C loader, then the pure-Python loader.
+    Dumping still goes through PyYAML since ryaml does not emit.
+
+    Args:
+        path: Path to the YAML file
+
+    Returns:
+        Parsed YAML document
+    """
+    text = Path(path).read_text()
+    if ryaml is not None:
+        return ryaml.loads(text)
+    return yaml.load(text, Loader=_SafeLoader)
+
+
+def _msgpack_loads(raw: bytes) -> Any:
+    return msgpack.unpackb(raw, strict_map_key=False)
+
+
+def _json_dumps(data: Any) -> bytes:
+    return json.dumps(data).encode()
+
+
+# Sidecar cache format: msgpack when installed, JSON otherwise. Both are
+# data-only, so a planted cache file can't run code the way pickle could.
+if msgpack is not None:
+    CONFIG_CACHE_SUFFIX = ".msgpack"
+    _cache_loads, _cache_dumps = _msgpack_loads, msgpack.packb
+else:
+    CONFIG_CACHE_SUFFIX = ".json"
+    _cache_loads, _cache_dumps = json.loads, _json_dumps
+
+
+def _source_stamp(path: Path) -> List[int]:
+    """Identify a file version by its nanosecond mtime and size."""
+    st = path.stat()
+    return [st.st_mtime_ns, st.st_size]
+
+
+def load_yaml_cached(path: Path) -> Any:
+    """Parse a YAML file, reusing a serialized copy when it is up to date.
+
+    The parsed document is cached next to the YAML file
+    (``<name>.yml.msgpack``, or ``<name>.yml.json`` without msgpack) together
+    with the YAML file's mtime and size, and reused only while both still
+    match. Documents the cache format can't store faithfully (e.g. dates or
+    non-string keys in JSON) are not cached. Failing to write the cache (e.g.
+    read-only directory) is not an error.
+
+    Args:
+        path: Path to the YAML file
+
+    Returns:
+        Parsed YAML document
+    """
+    path = Path(path)
+    cache_path = path.with_suffix(path.suffix + CONFIG_CACHE_SUFFIX)
+
+    stamp = _source_stamp(path)
+    try:
+        cached = _cache_loads(cache_path.read_bytes())
+        if cached["source"] == stamp:
+            return cached["data"]
+    except Exception:
+        pass
+
+    data = load_yaml(path)
+
+    # Write atomically so concurrent loaders never see a partial cache
+    tmp_path = None
+    try:
+        entry = {"source": stamp, "data": data}
+        raw = _cache_dumps(entry)
+        if _cache_loads(raw) != entry:
+            return data
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=cache_path.name, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(raw)
+        os.replace(tmp_path, cache_path)
+    except Exception:
+        if tmp_path and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+    return data
+
 
 def create_config(
     bind_ip: str,
@@ -70,7 +177,7 @@ def write_cfg(cfg_path: Path, bind_ip: str, paths: List[str], creds: Dict[str, s
     """Generate mediamtx.yml at cfg_path."""
     config = create_config(bind_ip, paths, creds, tls_key, tls_cert)
     
-    yaml_text = yaml.safe_dump(config)
+    yaml_text = yaml.dump(config, Dumper=_SafeDumper)
     cfg_path.write_text(yaml_text)
     os.chmod(cfg_path, 0o600)
 
@@ -88,8 +195,7 @@ def load_config_paths(config_path: Path) -> List[str]:
         typer.Exit: If paths cannot be loaded
     """
     try:
-        with open(config_path, "r") as f:
-            config = yaml.safe_load(f)
+        config = load_yaml(config_path)  # Not cached: it holds credentials
             
         paths_config = config.get("paths", {})
         if not paths_config:
@@ -102,6 +208,73 @@ def load_config_paths(config_path: Path) -> List[str]:
         raise typer.Exit(1)
 
 
+@dataclass(frozen=True)
+class ResolvedConfig:
+    """Flattened, immutable view of surveillance.yml with defaults applied.
+    
+    Built once per load so accessors are a single attribute read instead of
+    a chain of ``dict.get`` calls with throwaway default dicts.
+    """
+    
+    cameras: List[str] = field(default_factory=lambda: list(DEFAULT_PATHS))
+    bind: str = '0.0.0.0'
+    api_port: int = 3333
+    detection_enabled: bool = True
+    detection_port: int = 8080
+    detection_model: str = 'yolov8n.pt'
+    detection_confidence: float = 0.4
+    detection_resolution: Tuple[int, int] = (960, 540)
+    tls_key: Optional[Path] = None
+    tls_cert: Optional[Path] = None
+    recording_enabled: bool = True
+    recording_min_confidence: float = 0.5
+    recording_pre_buffer: int = 10
+    recording_post_buffer: int = 10
+    recording_max_storage: float = 10.0
+    recordings_dir: str = os.path.expanduser('~/video-feed-recordings')
+    record_objects: List[str] = field(default_factory=list)
+    
+    @classmethod
+    def from_dict(cls, config_data: Dict[str, Any]) -> 'ResolvedConfig':
+        """Flatten a parsed surveillance.yml dictionary.
+        
+        Args:
+            config_data: Parsed configuration dictionary
+            
+        Returns:
+            ResolvedConfig instance
+        """
+        network = config_data.get('network') or {}
+        detection = config_data.get('detection') or {}
+        security = config_data.get('security') or {}
+        recording = config_data.get('recording') or {}
+        resolution = detection.get('resolution') or {}
+        
+        tls_key = tls_cert = None
+        if security.get('use_tls', False) and security.get('tls_key') and security.get('tls_cert'):
+            tls_key, tls_cert = Path(security['tls_key']), Path(security['tls_cert'])
+        
+        return cls(
+            cameras=config_data.get('cameras', DEFAULT_PATHS),
+            bind=network.get('bind', '0.0.0.0'),
+            api_port=network.get('api_port', 3333),
+            detection_enabled=detection.get('enabled', True),
+            detection_port=detection.get('port', 8080),
+            detection_model=detection.get('model', 'yolov8n.pt'),
+            detection_confidence=detection.get('confidence', 0.4),
+            detection_resolution=(resolution.get('width', 960), resolution.get('height', 540)),
+            tls_key=tls_key,
+            tls_cert=tls_cert,
+            recording_enabled=recording.get('enabled', True),
+            recording_min_confidence=recording.get('min_confidence', 0.5),
+            recording_pre_buffer=recording.get('pre_buffer_seconds', 10),
+            recording_post_buffer=recording.get('post_buffer_seconds', 10),
+            recording_max_storage=recording.get('max_storage_gb', 10.0),
+            recordings_dir=os.path.expanduser(recording.get('recordings_dir', '~/video-feed-recordings')),
+            record_objects=recording.get('record_objects', []),
+        )
+
+
 class SurveillanceConfig:
     """Unified configuration management for surveillance system."""
     
@@ -113,6 +286,7 @@ class SurveillanceConfig:
         """
         self.config_file = config_file
         self.config_data = {}
+        self.cfg = ResolvedConfig()
         
         if config_file and config_file.exists():
             self.load_from_file(config_file)
@@ -126,8 +300,8 @@ class SurveillanceConfig:
             config_file: Path to YAML configuration file
         """
         try:
-            with open(config_file, 'r') as f:
-                self.config_data = yaml.safe_load(f) or {}
+            self.config_data = load_yaml_cached(config_file) or {}
+            self.cfg = ResolvedConfig.from_dict(self.config_data)
         except Exception as e:
             typer.secho(f"Error loading configuration: {e}", fg=typer.colors.RED)
             raise typer.Exit(1)
@@ -165,10 +339,11 @@ class SurveillanceConfig:
                 'record_objects': []
             }
         }
+        self.cfg = ResolvedConfig.from_dict(self.config_data)
     
     def get_cameras(self) -> List[str]:
         """Get camera stream paths."""
-        return self.config_data.get('cameras', DEFAULT_PATHS)
+        return self.cfg.cameras
     
     def get_network_config(self) -> Dict[str, Any]:
         """Get network configuration."""
@@ -188,32 +363,31 @@ class SurveillanceConfig:
     
     def get_bind_address(self) -> str:
         """Get bind address."""
-        return self.get_network_config().get('bind', '0.0.0.0')
+        return self.cfg.bind
     
     def get_api_port(self) -> int:
         """Get API port."""
-        return self.get_network_config().get('api_port', 3333)
+        return self.cfg.api_port
     
     def is_detection_enabled(self) -> bool:
         """Check if detection is enabled."""
-        return self.get_detection_config().get('enabled', True)
+        return self.cfg.detection_enabled
     
     def get_detection_port(self) -> int:
         """Get detection port."""
-        return self.get_detection_config().get('port', 8080)
+        return self.cfg.detection_port
     
     def get_detection_model(self) -> str:
         """Get detection model."""
-        return self.get_detection_config().get('model', 'yolov8n.pt')
+        return self.cfg.detection_model
     
     def get_detection_confidence(self) -> float:
         """Get detection confidence."""
-        return self.get_detection_config().get('confidence', 0.4)
+        return self.cfg.detection_confidence
     
     def get_detection_resolution(self) -> tuple:
         """Get detection resolution."""
-        res = self.get_detection_config().get('resolution', {})
-        return (res.get('width', 960), res.get('height', 540))
+        return self.cfg.detection_resolution
     
     def get_tls_config(self) -> tuple:
         """Get TLS configuration.
@@ -221,37 +395,27 @@ class SurveillanceConfig:
         Returns:
             Tuple of (tls_key_path, tls_cert_path) or (None, None)
         """
-        security = self.get_security_config()
-        if not security.get('use_tls', False):
-            return None, None
-            
-        tls_key = security.get('tls_key', '')
-        tls_cert = security.get('tls_cert', '')
-        
-        if tls_key and tls_cert:
-            return Path(tls_key), Path(tls_cert)
-        
-        return None, None
+        return self.cfg.tls_key, self.cfg.tls_cert
     
     def is_recording_enabled(self) -> bool:
         """Check if recording is enabled."""
-        return self.get_recording_config().get('enabled', True)
+        return self.cfg.recording_enabled
     
     def get_recording_min_confidence(self) -> float:
         """Get minimum confidence for recording."""
-        return self.get_recording_config().get('min_confidence', 0.5)
+        return self.cfg.recording_min_confidence
     
     def get_recording_pre_buffer(self) -> int:
         """Get pre-detection buffer seconds."""
-        return self.get_recording_config().get('pre_buffer_seconds', 10)
+        return self.cfg.recording_pre_buffer
     
     def get_recording_post_buffer(self) -> int:
         """Get post-detection buffer seconds."""
-        return self.get_recording_config().get('post_buffer_seconds', 10)
+        return self.cfg.recording_post_buffer
     
     def get_recording_max_storage(self) -> float:
         """Get maximum storage in GB."""
-        return self.get_recording_config().get('max_storage_gb', 10.0)
+        return self.cfg.recording_max_storage
     
     def get_recordings_directory(self) -> str:
         """Get recordings directory.
@@ -259,9 +423,7 @@ class SurveillanceConfig:
         Returns:
             str: Path to recordings directory, with ~ expanded to user's home directory
         """
-        path = self.get_recording_config().get('recordings_dir', '~/video-feed-recordings')
-        # Ensure the path is expanded
-        return os.path.expanduser(path)
+        return self.cfg.recordings_dir
     
     def get_record_objects(self) -> list:
         """Get list of objects to record.
@@ -269,4 +431,4 @@ class SurveillanceConfig:
         Returns:
             List of object classes to record. Empty list means record all objects.
         """
-        return self.get_recording_config().get('record_objects', [])
+        return self.cfg.record_objects
@@ -4,7 +4,7 @@ import secrets
 import keyring
 from typing import Dict
 
-from .constants import APP_NAME, KEYCHAIN_SERVICE
+from .constants import KEYCHAIN_SERVICE
 
 
 def rand_secret() -> str:
@@ -52,25 +52,30 @@ def load_config_credentials(config_path) -> Dict[str, str]:
     Raises:
         typer.Exit: If configuration cannot be loaded
     """
-    import yaml
     import typer
+    from .config import load_yaml
     
     try:
-        with open(config_path, "r") as f:
-            config = yaml.safe_load(f)
+        config = load_yaml(config_path)  # Not cached: no plaintext credential sidecar
             
         creds = {}
-        if "authInternalUsers" in config:
-            for user_info in config["authInternalUsers"]:
-                if user_info.get("permissions"):
-                    for perm in user_info["permissions"]:
-                        if perm.get("action") == "publish":
-                            creds["publish_user"] = user_info["user"]
-                            creds["publish_pass"] = user_info["pass"]
-                        elif perm.get("action") == "read":
-                            creds["read_user"] = user_info["user"]
-                            creds["read_pass"] = user_info["pass"]
-        
+        for user_info in config.get("authInternalUsers", []):
+            # Each user has a single role, so the first permission decides it
+            perms = user_info.get("permissions")
+            if not perms:
+                continue
+            action = perms[0].get("action")
+            if action == "publish":
+                creds["publish_user"] = user_info["user"]
+                creds["publish_pass"] = user_info["pass"]
+            elif action in ("read", "playback"):
+                creds["read_user"] = user_info["user"]
+                creds["read_pass"] = user_info["pass"]
+
+            # Stop scanning once both credential sets are found
+            if "publish_user" in creds and "read_user" in creds:
+                break
+
         # Validate we have all required credentials
         required_keys = ["publish_user", "publish_pass", "read_user", "read_pass"]
         if not all(k in creds for k in required_keys):
@@ -4,15 +4,20 @@ import cv2
 import numpy as np
 import time
 import os
-from typing import Dict, List, Tuple, Optional, Union, Any
+import re
+from typing import Dict, List, Tuple, Optional
 from pathlib import Path
 import threading
 import queue
+import torch
 from ultralytics import YOLO
+from ultralytics.engine.results import Results
+from ultralytics.utils import ops
 import supervision as sv
 import logging
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 import uuid
+from collections import deque
 
 from videofeed.recorder import RecordingManager
 from videofeed.detector_config import DetectorConfig
@@ -23,6 +28,572 @@ logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger('video-detector')
 
+def _cuda_video_available() -> bool:
+    """Check whether OpenCV was built with CUDA video decoding."""
+    try:
+        return hasattr(cv2, "cudacodec") and cv2.cuda.getCudaEnabledDeviceCount() > 0
+    except Exception:
+        return False
+
+
+# FPS is recomputed about once per this many nanoseconds
+FPS_WINDOW_NS = 1_000_000_000
+
+# Seconds without preview requests after which frames are only annotated when served
+VIEWER_IDLE_TIMEOUT = 2.0
+
+# Credentials embedded in stream URLs (user:pass@)
+_CRED_RE = re.compile(r'://([^:]+):([^@]+)@')
+
+# Evaluated once; stock opencv-python wheels have no CUDA support
+CUDA_VIDEO_AVAILABLE = _cuda_video_available()
+
+def fp16_supported() -> bool:
+    """Check for a CUDA GPU with native FP16 (Volta / compute 7.0 or newer)."""
+    try:
+        return torch.cuda.is_available() and torch.cuda.get_device_capability()[0] >= 7
+    except Exception:
+        return False
+
+
+def tune_torch_backend(model: YOLO) -> None:
+    """Switch an initialized PyTorch predictor to channels-last on CUDA.
+    
+    Must run after the first prediction: Ultralytics fuses Conv+BN layers
+    while setting up the predictor, which would drop the memory format.
+    Tensor Core convolutions run fastest on NHWC weights and activations.
+    TensorRT engines and CPU models are left untouched.
+    """
+    backend = getattr(getattr(model, "predictor", None), "model", None)
+    if backend is None or not getattr(backend, "pt", False) or not torch.cuda.is_available():
+        return
+    torch.backends.cudnn.benchmark = True  # Input sizes are fixed per stream
+    torch.set_float32_matmul_precision("high")
+    backend.model.to(memory_format=torch.channels_last)
+
+
+# Make sure OpenCV's vectorized (SSE/AVX/NEON) HAL kernels are used for the
+# per-frame color conversion and resize in the capture thread
+cv2.setUseOptimized(True)
+
+# Parallelism comes from one capture thread per stream; OpenCV's own worker
+# pool on top of that only oversubscribes the cores for these small frames
+cv2.setNumThreads(1)
+
+try:
+    from torchvision.io import encode_jpeg as _tv_encode_jpeg
+except ImportError:
+    _tv_encode_jpeg = None
+
+# nvJPEG through torchvision needs a CUDA device; otherwise encode on the CPU
+_gpu_jpeg = _tv_encode_jpeg is not None and torch.cuda.is_available()
+
+# Default preview quality; previews are viewed at stream size, where 80 is
+# visually close to 95 at roughly half the bytes
+JPEG_QUALITY = 80
+
+
+def encode_jpeg(frame: np.ndarray, quality: int = JPEG_QUALITY) -> bytes:
+    """Encode a BGR frame as 4:2:0 JPEG, on the GPU when nvJPEG is available.
+    
+    Args:
+        frame: BGR frame to encode
+        quality: JPEG quality (1-100)
+    
+    Returns:
+        JPEG bytes
+    """
+    global _gpu_jpeg
+    if _gpu_jpeg:
+        try:
+            # HWC BGR -> CHW RGB on the device
+            tensor = torch.from_numpy(frame).cuda().permute(2, 0, 1).flip(0).contiguous()
+            return _tv_encode_jpeg(tensor, quality=quality).cpu().numpy().tobytes()
+        except Exception as e:
+            logger.warning(f"GPU JPEG encoding unavailable, using OpenCV: {e}")
+            _gpu_jpeg = False
+    _, buffer = cv2.imencode('.jpg', frame, [
+        cv2.IMWRITE_JPEG_QUALITY, quality,
+        cv2.IMWRITE_JPEG_SAMPLING_FACTOR, cv2.IMWRITE_JPEG_SAMPLING_FACTOR_420
+    ])
+    return buffer.tobytes()
+
+
+def tensorrt_precision(config: DetectorConfig) -> str:
+    """Pick the TensorRT engine precision for a config.
+    
+    FP16 needs Tensor Cores (Volta or newer); older GPUs such as Pascal get an
+    FP32 engine instead. INT8 needs a calibration dataset.
+    """
+    if config.int8 and config.calibration_data:
+        return "int8"
+    if config.half and fp16_supported():
+        return "fp16"
+    return "fp32"
+
+
+def build_calibration_dataset(source_url: str, model_path: str, config: DetectorConfig,
+                              count: int = 200, stride: int = 5) -> Optional[str]:
+    """Capture frames from a stream into an INT8 calibration dataset.
+    
+    Frames are sampled every ``stride`` reads so the set spans some scene
+    variation, resized to the detection resolution and stored next to the
+    checkpoint with a dataset YAML Ultralytics' exporter can read. An
+    existing dataset is reused.
+    
+    Args:
+        source_url: Stream to sample frames from
+        model_path: Resolved path to the ``.pt`` checkpoint
+        config: DetectorConfig with the detection resolution
+        count: Number of frames to capture
+        stride: Keep one frame out of every ``stride`` read
+    
+    Returns:
+        Path to the dataset YAML, or None if no frames could be captured
+    """
+    import yaml
+    
+    checkpoint = Path(model_path)
+    calib_dir = checkpoint.with_name(f"{checkpoint.stem}-calibration")
+    data_path = calib_dir / "calibration.yaml"
+    if data_path.exists():
+        return str(data_path)
+    
+    images_dir = calib_dir / "images"
+    images_dir.mkdir(parents=True, exist_ok=True)
+    logger.info(f"Capturing {count} calibration frames for INT8 export")
+    cap = cv2.VideoCapture(source_url, cv2.CAP_FFMPEG)
+    saved = reads = 0
+    try:
+        while saved < count and reads < count * stride * 2:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            reads += 1
+            if reads % stride:
+                continue
+            frame = cv2.resize(frame, tuple(config.resolution), interpolation=cv2.INTER_LINEAR)
+            cv2.imwrite(str(images_dir / f"{saved:04d}.jpg"), frame)
+            saved += 1
+    finally:
+        cap.release()
+    
+    if saved == 0:
+        return None
+    with open(data_path, "w") as f:
+        yaml.safe_dump({
+            "path": str(calib_dir),
+            "train": "images",
+            "val": "images",
+            "names": YOLO(model_path).names,
+        }, f)
+    return str(data_path)
+
+
+def inference_size(config: DetectorConfig) -> int:
+    """Inference size (longest side) TensorRT engines are built and run at.
+    
+    The configured resolution's longest side, rounded up to a multiple of the
+    model stride as TensorRT requires.
+    """
+    return -(-max(config.resolution) // 32) * 32
+
+
+def export_tensorrt_engine(model_path: str, config: DetectorConfig,
+                           source_url: Optional[str] = None) -> Optional[str]:
+    """Export a YOLO checkpoint to a TensorRT engine, reusing a cached build.
+    
+    Engines are cached next to the checkpoint, keyed by input size, batch and
+    precision, so the (slow) build only happens once per configuration.
+    
+    Args:
+        model_path: Resolved path to the ``.pt`` checkpoint
+        config: DetectorConfig with resolution, batch and precision settings
+        source_url: Stream to capture calibration frames from when
+            ``calibration_data`` is ``"auto"``
+    
+    Returns:
+        Path to the engine file, or None if export is unavailable
+    """
+    imgsz = inference_size(config)
+    precision = tensorrt_precision(config)
+    calibration_data = config.calibration_data
+    if precision == "int8" and calibration_data == "auto":
+        calibration_data = build_calibration_dataset(source_url, model_path, config) if source_url else None
+        if calibration_data is None:
+            precision = "fp16" if config.half and fp16_supported() else "fp32"
+    int8 = precision == "int8"
+    if config.int8 and not int8:
+        logger.warning(f"INT8 export requested without calibration data, using {precision.upper()} instead")
+    
+    checkpoint = Path(model_path)
+    engine_path = checkpoint.with_name(
+        f"{checkpoint.stem}-{imgsz}-b{config.max_batch}-{precision}.engine"
+    )
+    if engine_path.exists():
+        return str(engine_path)
+    
+    try:
+        logger.info(f"Exporting {checkpoint.name} to TensorRT ({precision}, batch {config.max_batch})")
+        exported = YOLO(model_path).export(
+            format="engine",
+            imgsz=imgsz,
+            half=precision == "fp16",
+            int8=int8,
+            data=calibration_data if int8 else None,
+            dynamic=True,
+            batch=config.max_batch,
+            workspace=4,
+            verbose=False,
+        )
+        os.replace(exported, engine_path)
+        return str(engine_path)
+    except Exception as e:
+        logger.warning(f"TensorRT export failed, falling back to PyTorch: {e}")
+        return None
+
+
+class PinnedFrameBatcher:
+    """Stage frame batches for the GPU through reusable pinned buffers.
+    
+    Raw uint8 frames are copied into a page-locked host tensor and uploaded
+    asynchronously to a persistent device tensor on a dedicated CUDA stream.
+    Letterbox resize, BGR->RGB, HWC->CHW and normalization all run on the
+    device, so only uint8 pixels cross PCIe and the CPU never touches them
+    again. Nothing is allocated per batch once the buffers exist for a given
+    frame size.
+    
+    The device-side preprocessing is captured once per batch size as a CUDA
+    graph and replayed, so each batch costs a single graph launch instead of
+    one launch per kernel. The returned batch is a view of a static buffer
+    and is only valid until the next ``prepare`` call.
+    
+    Batches are contiguous NCHW, which every backend accepts; TensorRT and
+    other exported backends read the raw buffer as NCHW. Once the backend is
+    loaded, ``match_backend`` switches PyTorch models to channels-last and
+    sets the dtype to the backend's input precision.
+    """
+    
+    def __init__(self, max_batch: int, imgsz: int = 640, stride: int = 32, half: bool = False):
+        """Initialize the batcher.
+        
+        Args:
+            max_batch: Maximum number of frames per batch
+            imgsz: Inference size (longest side), as used by Ultralytics
+            stride: Model stride the padded size must be a multiple of
+            half: Produce FP16 batches for a half-precision model
+        """
+        self.max_batch = max_batch
+        self.imgsz = imgsz
+        self.stride = stride
+        self.dtype = torch.float16 if half else torch.float32
+        self.memory_format = torch.contiguous_format
+        self.stream = torch.cuda.Stream()
+        self._upload_done = torch.cuda.Event()
+        self._frame_shape = None
+        self._host = None
+        self._host_np = None
+        self._device = None
+        self._out = None
+        self._graphs = {}  # batch size -> captured CUDA graph, None if unsupported
+        
+    def _allocate(self, frame_shape: Tuple[int, ...]) -> None:
+        """(Re)build letterbox geometry and buffers for a frame size."""
+        h, w = frame_shape[:2]
+        r = min(self.imgsz / h, self.imgsz / w)
+        new_w, new_h = int(round(w * r)), int(round(h * r))
+        # Minimal rectangle padding, matching Ultralytics' auto letterbox
+        pad_w = (self.imgsz - new_w) % self.stride
+        pad_h = (self.imgsz - new_h) % self.stride
+        self.left, self.top = int(round(pad_w / 2 - 0.1)), int(round(pad_h / 2 - 0.1))
+        self.ratio = r
+        self.new_size = (new_w, new_h)
+        
+        in_shape = (self.max_batch, h, w, 3)
+        self._host = torch.empty(in_shape, dtype=torch.uint8).pin_memory()
+        self._host_np = self._host.numpy()
+        self._device = torch.empty(in_shape, dtype=torch.uint8, device="cuda")
+        # Padding is filled once here; only the image area is rewritten per batch
+        self._out = torch.empty(
+            (self.max_batch, 3, new_h + pad_h, new_w + pad_w),
+            dtype=self.dtype, device="cuda", memory_format=self.memory_format
+        ).fill_(114 / 255.0)
+        self._frame_shape = frame_shape
+        # Captured graphs point at the old buffers
+        if self._graphs is not None:
+            self._graphs = {}
+        
+    def match_backend(self, backend) -> None:
+        """Adapt the batch layout and dtype to a loaded Ultralytics AutoBackend.
+        
+        Only PyTorch models (tuned to channels-last by ``tune_torch_backend``)
+        get NHWC batches; anything else keeps contiguous NCHW. Batches are
+        FP16 only if the backend takes FP16 input: INT8 and FP32 engines bind
+        an FP32 input, and the direct path casts nothing.
+        """
+        memory_format = torch.channels_last if getattr(backend, "pt", False) else torch.contiguous_format
+        dtype = torch.float16 if getattr(backend, "fp16", False) else torch.float32
+        if memory_format != self.memory_format or dtype != self.dtype:
+            self.memory_format = memory_format
+            self.dtype = dtype
+            self._frame_shape = None  # Reallocate on the next prepare
+        
+    def _convert(self, b: int) -> None:
+        """Letterbox the first ``b`` uploaded frames into normalized BCHW RGB."""
+        new_w, new_h = self.new_size
+        images = self._device[:b].permute(0, 3, 1, 2).flip(1).to(self.dtype)
+        if images.shape[2:] != (new_h, new_w):
+            # Bilinear with half-pixel centers, like cv2.INTER_LINEAR
+            images = torch.nn.functional.interpolate(
+                images, size=(new_h, new_w), mode="bilinear", align_corners=False
+            )
+        region = self._out[:b, :, self.top:self.top + new_h, self.left:self.left + new_w]
+        region.copy_(images).div_(255.0)
+        
+    def _run_convert(self, b: int) -> None:
+        """Run the conversion on the batcher stream, through a CUDA graph if possible."""
+        if self._graphs is not None:
+            graph = self._graphs.get(b)
+            if graph is None:
+                try:
+                    # Warm up once outside capture, then record the kernels
+                    self._convert(b)
+                    graph = torch.cuda.CUDAGraph()
+                    with torch.cuda.graph(graph, stream=self.stream):
+                        self._convert(b)
+                    self._graphs[b] = graph
+                except Exception as e:
+                    logger.warning(f"CUDA graph capture unavailable, launching kernels directly: {e}")
+                    self._graphs = None
+                    self._convert(b)
+                    return
+            graph.replay()
+        else:
+            self._convert(b)
+        
+    def prepare(self, frames: List[np.ndarray]) -> torch.Tensor:
+        """Letterbox frames and upload them as a normalized BCHW RGB batch.
+        
+        Args:
+            frames: BGR frames, all of the same shape
+        
+        Returns:
+            Float tensor on the GPU, ready for the model
+        """
+        if frames[0].shape != self._frame_shape:
+            self._allocate(frames[0].shape)
+        
+        # The previous async upload must finish before the host buffer is reused
+        self._upload_done.synchronize()
+        b = len(frames)
+        for i, frame in enumerate(frames):
+            self._host_np[i] = frame
+        
+        with torch.cuda.stream(self.stream):
+            self._device[:b].copy_(self._host[:b], non_blocking=True)
+            self._upload_done.record(self.stream)
+            self._run_convert(b)
+        torch.cuda.current_stream().wait_stream(self.stream)
+        return self._out[:b]
+        
+    def restore_boxes(self, result, frame_shape: Tuple[int, ...]) -> None:
+        """Map a result's boxes from letterboxed back to frame coordinates."""
+        boxes = result.boxes
+        if boxes is not None and len(boxes):
+            xyxy = boxes.data[:, :4]
+            xyxy[:, [0, 2]] -= self.left
+            xyxy[:, [1, 3]] -= self.top
+            xyxy /= self.ratio
+            xyxy[:, [0, 2]] = xyxy[:, [0, 2]].clamp(0, frame_shape[1])
+            xyxy[:, [1, 3]] = xyxy[:, [1, 3]].clamp(0, frame_shape[0])
+        result.orig_shape = frame_shape[:2]
+        if boxes is not None:
+            boxes.orig_shape = frame_shape[:2]
+
+
+class BatchInferenceWorker:
+    """Run one shared model for many detectors, batching their frames.
+    
+    Detectors submit single frames; the worker thread gathers whatever is
+    pending (up to ``max_batch``) into one ``model([...])`` call and hands each
+    detector back its own result. This keeps the GPU busy with fewer, larger
+    kernel launches instead of one small launch per stream.
+    """
+    
+    def __init__(self, model: YOLO, max_batch: int = 8, batch_timeout: float = 0.005, half: bool = False,
+                 imgsz: int = 640, result_timeout: float = 5.0):
+        """Initialize the inference worker.
+        
+        Args:
+            model: Loaded YOLO model owned by this worker
+            max_batch: Maximum number of frames per inference call
+            batch_timeout: Seconds to wait for more frames once one is pending
+            half: Run inference in FP16 (ignored without FP16-capable CUDA)
+            imgsz: Inference size (longest side); TensorRT engines must get
+                the size they were exported at (see ``inference_size``)
+            result_timeout: Default seconds ``infer`` waits for a result once
+                the first batch has completed
+        """
+        self.model = model
+        self.imgsz = imgsz
+        self.result_timeout = result_timeout
+        # The first batch sets up the predictor, autotunes cuDNN and captures
+        # CUDA graphs, so it may take far longer than steady-state batches
+        self.warmed_up = False
+        self.max_batch = max(1, max_batch)
+        self.batch_timeout = batch_timeout
+        self.half = half and fp16_supported()
+        self.iou = 0.7  # Ultralytics' default NMS IoU threshold
+        self.backend = None  # Underlying AutoBackend once the predictor is set up
+        self._backend_tuned = False
+        self.requests = queue.Queue()
+        self.running = False
+        self.thread = None
+        
+        # Pinned-memory staging is only useful with a CUDA device
+        self.batcher = (
+            PinnedFrameBatcher(self.max_batch, imgsz=imgsz, half=self.half) if torch.cuda.is_available() else None
+        )
+        
+    def start(self) -> None:
+        """Start the inference thread."""
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        
+    def stop(self) -> None:
+        """Stop the inference thread and fail any pending requests."""
+        self.running = False
+        if self.thread and self.thread.is_alive():
+            self.thread.join(timeout=2.0)
+        while True:
+            try:
+                _, _, future = self.requests.get_nowait()
+            except queue.Empty:
+                break
+            if future.set_running_or_notify_cancel():
+                future.set_exception(RuntimeError("Inference worker stopped"))
+            
+    def infer(self, frame: np.ndarray, confidence: float, timeout: Optional[float] = None):
+        """Run detection on a single frame through the shared batch.
+        
+        Until the first batch has completed there is no time limit.
+        
+        Args:
+            frame: BGR frame to run detection on
+            confidence: Detection confidence threshold
+            timeout: Seconds to wait for the result (default ``result_timeout``)
+        
+        Returns:
+            List with a single Ultralytics result, like ``model(frame)``
+        
+        Raises:
+            concurrent.futures.TimeoutError: No result in time; the frame is
+                dropped from the queue, or its late result discarded
+        """
+        future = Future()
+        self.requests.put((frame, confidence, future))
+        if not self.warmed_up:
+            timeout = None
+        elif timeout is None:
+            timeout = self.result_timeout
+        try:
+            return [future.result(timeout=timeout)]
+        except FutureTimeoutError:
+            # Still queued: the worker skips it. Already running: the result
+            # is set on a future nobody waits for any more
+            future.cancel()
+            raise
+        
+    def _run(self) -> None:
+        """Gather pending frames into batches and run inference."""
+        while self.running:
+            try:
+                batch = [self.requests.get(timeout=1.0)]
+            except queue.Empty:
+                continue
+            
+            # Collect more frames for a short while, up to the batch limit
+            deadline = time.monotonic() + self.batch_timeout
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.requests.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            # Detectors normally share a threshold and size; group just in case they don't
+            groups = {}
+            for item in batch:
+                groups.setdefault((item[1], item[0].shape), []).append(item)
+            
+            for (confidence, _), items in groups.items():
+                # Drop frames whose detector stopped waiting; the rest can no
+                # longer be cancelled, so setting their result is safe
+                items = [item for item in items if item[2].set_running_or_notify_cancel()]
+                if not items:
+                    continue
+                frames = [item[0] for item in items]
+                try:
+                    results = self._infer_batch(frames, confidence)
+                    self.warmed_up = True
+                    for (_, _, future), result in zip(items, results):
+                        future.set_result(result)
+                except Exception as e:
+                    logger.error(f"Batched inference failed: {e}")
+                    for _, _, future in items:
+                        future.set_exception(e)
+                        
+    def _infer_batch(self, frames: List[np.ndarray], confidence: float):
+        """Run the model on same-sized frames, via pinned buffers when possible."""
+        if self.batcher is not None:
+            try:
+                batch = self.batcher.prepare(frames)
+                if self.backend is not None:
+                    results = self._predict_direct(batch, frames, confidence)
+                else:
+                    # The first call goes through Ultralytics to build the predictor
+                    results = self.model(batch, conf=confidence, half=self.half, imgsz=self.imgsz, verbose=False)
+                    self._tune_backend()
+                    if self.model.task == "detect":
+                        self.backend = self.model.predictor.model
+                        self.batcher.match_backend(self.backend)
+                for frame, result in zip(frames, results):
+                    self.batcher.restore_boxes(result, frame.shape)
+                return results
+            except Exception as e:
+                logger.warning(f"Pinned-buffer inference unavailable, using default path: {e}")
+                self.batcher = None
+                self.backend = None
+        results = self.model(frames, conf=confidence, half=self.half, imgsz=self.imgsz, verbose=False)
+        self._tune_backend()
+        return results
+        
+    def _tune_backend(self) -> None:
+        """Apply backend tuning once the predictor exists."""
+        if not self._backend_tuned:
+            tune_torch_backend(self.model)
+            self._backend_tuned = True
+        
+    def _predict_direct(self, batch: torch.Tensor, frames: List[np.ndarray], confidence: float) -> List[Results]:
+        """Run the backend on a preprocessed batch, skipping the predictor wrapper.
+        
+        NMS runs on the GPU and boxes stay there until the caller converts the
+        (small) filtered result.
+        """
+        with torch.inference_mode():
+            preds = self.backend(batch)
+        detections = ops.non_max_suppression(preds, confidence, self.iou, max_det=300)
+        return [
+            Results(frame, path="", names=self.model.names, boxes=det[:, :6])
+            for frame, det in zip(frames, detections)
+        ]
+
+
 class RTSPObjectDetector:
     """Process RTSP stream with YOLO object detection."""
     
@@ -40,20 +611,41 @@ class RTSPObjectDetector:
             recording_manager: Optional recording manager for event-based recording
         """
         self.source_url = source_url
+        self._masked_url = self._mask_credentials(source_url)
+        self.secure = source_url.startswith("rtsps://")
+        self._name = self._compute_name()
         self.config = config or DetectorConfig()
         
         # Extract config values for convenience
         self.model_path = resolve_model_path(self.config.model_path)
         self.confidence = self.config.confidence
-        self.buffer_size = self.config.buffer_size
         self.reconnect_interval = self.config.reconnect_interval
         self.resolution = self.config.resolution
+        self.half = self.config.half and fp16_supported()
         
         # Initialize components
         self.model = None
+        self.imgsz = 640  # Inference size; engines use the size they were exported at
+        self._backend_tuned = False
+        self.inference_worker = None  # Shared batch worker set by DetectorManager
         self.cap = None
-        self.frame_buffer = queue.Queue(maxsize=self.buffer_size)
+        self.gpu_reader = None  # cv2.cudacodec reader when decoding on the GPU
+        self._gpu_resized = None  # Reused device buffer for GPU resizes
+        self._gpu_bgr = None  # Reused device buffer for BGRA->BGR conversion
+        self._cuda_stream = None  # Per-detector cv2.cuda.Stream for the GPU path
+        # Latest-frame slot: capture overwrites it, processing takes the newest
+        self._pending_frame = None
+        self._frame_ready = threading.Event()
         self.latest_frame = None
+        # (frame, annotation args) when latest_frame was published unannotated
+        self._unannotated = None
+        self._jpeg_cache = (None, b"")  # (source frame, encoded bytes)
+        self._jpeg_lock = threading.Lock()
+        self._frame_listeners = ()  # Callbacks run after each processed frame
+        self._listeners_lock = threading.Lock()
+        self._prev_gray = None  # Downscaled previous frame for motion gating
+        self._allowed_class_ids = None  # filter_classes resolved to model class IDs
+        self._last_view_time = float("-inf")  # Last preview request, for skipping annotation
         self.running = False
         self.processing_thread = None
         self.capture_thread = None
@@ -61,8 +653,13 @@ class RTSPObjectDetector:
         # Stats
         self.fps = 0
         self.frame_count = 0
-        self.last_fps_update = 0
-        self.detections = []
+        self.last_fps_update = 0  # time.monotonic_ns() of the last FPS update
+        self.fps_history = deque(maxlen=60)  # Recent per-window FPS samples
+        # Frame counters; each is only written by one thread, so reads need no lock
+        self.frames_captured = 0
+        self.frames_processed = 0
+        self.frames_dropped = 0  # Overwritten in the latest-frame slot before processing
+        self.detections = sv.Detections.empty()  # Latest detections, kept as arrays
         
         # Supervision annotators from config
         self.box_annotator = self.config.create_box_annotator()
@@ -73,11 +670,15 @@ class RTSPObjectDetector:
         self.detector_id = str(uuid.uuid4())  # Unique ID for this detector instance
         
     def load_model(self) -> None:
-        """Load YOLO model."""
+        """Load YOLO model, exporting it to a TensorRT engine if configured."""
         try:
+            model_path = self.model_path
+            if self.config.engine == "tensorrt" and model_path.endswith(".pt"):
+                model_path = export_tensorrt_engine(model_path, self.config, self.source_url) or model_path
+                self.imgsz = inference_size(self.config)
             # Silent - model loading shown once in DetectorManager
-            # logger.info(f"Loading YOLO model: {self.model_path}")
-            self.model = YOLO(self.model_path)
+            # logger.info(f"Loading YOLO model: {model_path}")
+            self.model = YOLO(model_path, task="detect")
             # logger.info("Model loaded successfully")
         except Exception as e:
             logger.error(f"Failed to load model: {e}")
@@ -88,7 +689,8 @@ class RTSPObjectDetector:
         if self.running:
             return
             
-        if self.model is None:
+        # Managed detectors run inference through the shared worker instead
+        if self.model is None and self.inference_worker is None:
             self.load_model()
             
         self.running = True
@@ -120,12 +722,9 @@ class RTSPObjectDetector:
         if self.recording_manager:
             self.recording_manager.unregister_stream(self.detector_id)
         
-        # Clear the buffer to unblock any waiting threads
-        try:
-            while not self.frame_buffer.empty():
-                self.frame_buffer.get_nowait()
-        except Exception:
-            pass
+        # Drop the pending frame and wake the processing thread
+        self._pending_frame = None
+        self._frame_ready.set()
             
         # Wait for threads to terminate
         if self.capture_thread and self.capture_thread.is_alive():
@@ -145,12 +744,16 @@ class RTSPObjectDetector:
             logger.info("Releasing capture device...")
             self.cap.release()
             self.cap = None
+        self.gpu_reader = None
+        self._gpu_resized = None
+        self._gpu_bgr = None
             
         # Reset state
         self.latest_frame = None
-        self.detections = []
+        self.detections = sv.Detections.empty()
         self.fps = 0
         self.frame_count = 0
+        self.fps_history.clear()
             
         logger.info("Detector stopped successfully")
         
@@ -158,9 +761,26 @@ class RTSPObjectDetector:
         """Connect to RTSP/RTSPS stream."""
         if self.cap is not None:
             self.cap.release()
+            self.cap = None
+        self.gpu_reader = None
+        
+        # Decode and resize on the GPU when OpenCV has CUDA video support
+        if self.config.gpu_decode and CUDA_VIDEO_AVAILABLE:
+            try:
+                self.gpu_reader = cv2.cudacodec.createVideoReader(self.source_url)
+                if hasattr(cv2.cudacodec, "ColorFormat_BGR"):
+                    self.gpu_reader.set(cv2.cudacodec.ColorFormat_BGR)
+                # Own stream so this detector's decode/resize never serializes
+                # with other streams or inference on the default stream
+                if self._cuda_stream is None:
+                    self._cuda_stream = cv2.cuda.Stream()
+                return True
+            except Exception as e:
+                logger.warning(f"GPU decoding unavailable, using CPU capture: {e}")
+                self.gpu_reader = None
             
         # Mask credentials in log message for security
-        log_url = self._mask_credentials(self.source_url)
+        log_url = self._masked_url
         # Silent - connection status shown in main display
         # logger.info(f"Connecting to stream: {log_url}")
         
@@ -185,62 +805,130 @@ class RTSPObjectDetector:
         
     def _mask_credentials(self, url: str) -> str:
         """Mask credentials in URL for logging purposes."""
-        import re
         # Check if the URL contains credentials (username:password@)
         if '@' in url:
             # Replace credentials with '***:***'
-            masked_url = re.sub(r'://([^:]+):([^@]+)@', r'://***:***@', url)
-            return masked_url
+            return _CRED_RE.sub(r'://***:***@', url)
         return url
         
+    def _is_connected(self) -> bool:
+        """Check whether a capture source is open."""
+        return self.gpu_reader is not None or (self.cap is not None and self.cap.isOpened())
+        
+    def _read_frame(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """Read the next frame at the configured resolution.
+        
+        On the GPU path the frame is decoded, color converted and resized on
+        the device, and only the resized frame is downloaded.
+        """
+        if self.gpu_reader is not None:
+            stream = self._cuda_stream
+            ret, gpu_frame = self.gpu_reader.nextFrame(stream=stream)
+            if not ret:
+                return False, None
+            if gpu_frame.channels() == 4:
+                self._gpu_bgr = cv2.cuda.cvtColor(
+                    gpu_frame, cv2.COLOR_BGRA2BGR, dst=self._gpu_bgr, stream=stream
+                )
+                gpu_frame = self._gpu_bgr
+            if self.resolution:
+                self._gpu_resized = cv2.cuda.resize(
+                    gpu_frame, self.resolution, dst=self._gpu_resized, stream=stream
+                )
+                gpu_frame = self._gpu_resized
+            frame = gpu_frame.download(stream=stream)
+            stream.waitForCompletion()
+            return True, frame
+        
+        ret, frame = self.cap.read()
+        # Skip the resize pass entirely when the stream already matches
+        if ret and self.resolution and (frame.shape[1], frame.shape[0]) != tuple(self.resolution):
+            # Area averaging for downscales: no aliasing (which also keeps the
+            # preview JPEGs smaller) and a fast path for 2x/4x ratios
+            shrinking = frame.shape[1] > self.resolution[0]
+            frame = cv2.resize(frame, self.resolution,
+                               interpolation=cv2.INTER_AREA if shrinking else cv2.INTER_LINEAR)
+        return ret, frame
+        
     def _capture_loop(self) -> None:
         """Main capture loop to read frames from RTSP."""
         while self.running:
-            if self.cap is None or not self.cap.isOpened():
+            if not self._is_connected():
                 if not self._connect_to_stream():
                     logger.info(f"Reconnecting in {self.reconnect_interval} seconds...")
                     time.sleep(self.reconnect_interval)
                     continue
             
-            ret, frame = self.cap.read()
+            try:
+                ret, frame = self._read_frame()
+            except cv2.error as e:
+                logger.warning(f"Frame decode error: {e}")
+                ret, frame = False, None
             if not ret:
                 logger.warning("Failed to read frame, reconnecting...")
                 time.sleep(1)
                 self._connect_to_stream()
                 continue
                 
-            # Resize frame if needed
-            if self.resolution:
-                frame = cv2.resize(frame, self.resolution)
-                
             # Update FPS counter
-            current_time = time.time()
-            if current_time - self.last_fps_update >= 1.0:
-                self.fps = self.frame_count
-                self.frame_count = 0
-                self.last_fps_update = current_time
+            # Integer nanoseconds from the monotonic clock: no float math per
+            # frame and no jumps when the wall clock is adjusted
             self.frame_count += 1
+            now = time.monotonic_ns()
+            elapsed = now - self.last_fps_update
+            if elapsed >= FPS_WINDOW_NS:
+                self.fps = round(self.frame_count * 1_000_000_000 / elapsed)
+                if self.last_fps_update:  # The first window has no start time
+                    self.fps_history.append(self.fps)
+                self.frame_count = 0
+                self.last_fps_update = now
             
-            # Send frame to recording manager buffer if available
+            # Share the frame with the recording buffer; the capture thread never
+            # touches it again and annotation draws on its own copy. Marking it
+            # read-only turns any accidental in-place write into an error.
             if self.recording_manager and frame is not None:
-                self.recording_manager.add_frame(self.detector_id, frame.copy())
+                frame.flags.writeable = False
+                self.recording_manager.add_frame(self.detector_id, frame)
             
-            # Add to buffer, drop frames if buffer is full
-            try:
-                self.frame_buffer.put(frame, block=False)
-            except queue.Full:
-                # Skip this frame if buffer is full
-                pass
+            # Publish as the latest frame; an unprocessed older frame is dropped
+            self.frames_captured += 1
+            if self._frame_ready.is_set():
+                self.frames_dropped += 1
+            self._pending_frame = frame
+            self._frame_ready.set()
                 
     def _processing_loop(self) -> None:
         """Process frames with object detection."""
+        last_frame = None
+        last_results = None
+        skipped = 0
         while self.running:
             try:
-                # Get frame from buffer
-                frame = self.frame_buffer.get(timeout=1.0)
+                # Wait for a new frame and take the newest one
+                if not self._frame_ready.wait(timeout=1.0):
+                    continue
+                self._frame_ready.clear()
+                frame = self._pending_frame
+                if frame is None or frame is last_frame:
+                    continue
+                last_frame = frame
                 
-                # Run YOLO detection
-                results = self.model(frame, conf=self.confidence, verbose=False)
+                # Without motion, redraw the previous results instead of running YOLO
+                still = self.config.motion_gate and not self._has_motion(frame)
+                if still and last_results is not None and skipped < self.config.motion_max_skip:
+                    results = last_results
+                    skipped += 1
+                # Run YOLO detection, batched with other streams when managed
+                elif self.inference_worker is not None:
+                    results = self.inference_worker.infer(frame, self.confidence)
+                else:
+                    results = self.model(frame, conf=self.confidence, half=self.half, imgsz=self.imgsz, verbose=False)
+                    if not self._backend_tuned:
+                        tune_torch_backend(self.model)
+                        self._backend_tuned = True
+                if results is not last_results:
+                    last_results = results
+                    skipped = 0
                 
                 # Process results
                 processed_frame, detections = self._process_results(frame, results)
@@ -248,14 +936,46 @@ class RTSPObjectDetector:
                 # Store latest processed frame and detections
                 self.latest_frame = processed_frame
                 self.detections = detections
+                self.frames_processed += 1
+                self._notify_frame_listeners()
                 
-            except queue.Empty:
-                # No frames in the buffer
-                continue
+            except FutureTimeoutError:
+                logger.warning(f"Inference timed out, skipping frame from {self._masked_url}")
             except Exception as e:
                 logger.error(f"Error processing frame: {e}")
                 time.sleep(0.1)
                 
+    def add_frame_listener(self, callback) -> None:
+        """Register a callback run (on the processing thread) after each new frame.
+        
+        Callbacks must be cheap and thread-safe, e.g. scheduling an
+        ``asyncio.Event.set`` with ``loop.call_soon_threadsafe``.
+        """
+        with self._listeners_lock:
+            self._frame_listeners = self._frame_listeners + (callback,)
+            
+    def remove_frame_listener(self, callback) -> None:
+        """Unregister a callback added with ``add_frame_listener``."""
+        with self._listeners_lock:
+            self._frame_listeners = tuple(cb for cb in self._frame_listeners if cb is not callback)
+            
+    def _notify_frame_listeners(self) -> None:
+        """Run the frame listeners; the tuple is replaced on change, so no lock is needed."""
+        for callback in self._frame_listeners:
+            try:
+                callback()
+            except RuntimeError:
+                pass  # Listener's event loop already closed
+                
+    def _has_motion(self, frame: np.ndarray) -> bool:
+        """Check whether a frame differs enough from the previous one to need detection."""
+        small = cv2.cvtColor(cv2.resize(frame, (160, 120), interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY)
+        prev, self._prev_gray = self._prev_gray, small
+        if prev is None:
+            return True
+        _, changed = cv2.threshold(cv2.absdiff(small, prev), 25, 255, cv2.THRESH_BINARY)
+        return cv2.countNonZero(changed) >= self.config.motion_threshold * changed.size
+        
     def _process_results(self, frame: np.ndarray, results):
         """Process YOLO results using Supervision and annotate frame."""
         # Extract the first result (only one image processed at a time)
@@ -267,44 +987,67 @@ class RTSPObjectDetector:
         # Apply filters using Supervision's native capabilities
         detections_sv = self._apply_filters(detections_sv, result.names)
         
-        # Build labels for each detection
-        labels = [
-            f"{result.names[class_id]} {confidence:.2f}"
-            for class_id, confidence in zip(detections_sv.class_id, detections_sv.confidence)
-        ]
+        # Pull confidences and class IDs out of NumPy once instead of per element
+        confidences = detections_sv.confidence.tolist() if len(detections_sv) else []
+        class_ids = detections_sv.class_id.tolist() if len(detections_sv) else []
         
-        # Annotate frame using Supervision
-        annotated_frame = self.box_annotator.annotate(
-            scene=frame.copy(),
-            detections=detections_sv
-        )
-        annotated_frame = self.label_annotator.annotate(
-            scene=annotated_frame,
-            detections=detections_sv,
-            labels=labels
-        )
-        
-        # Add FPS overlay
-        fps_text = f"FPS: {self.fps}"
-        cv2.putText(annotated_frame, fps_text, (10, 30), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 255), 2)
-        
-        # Convert to legacy format for backward compatibility with recording manager
-        detections_list = self._sv_to_legacy_format(detections_sv, result.names)
+        # Annotate now if someone is watching the preview or this frame may
+        # start a recording (its thumbnail and first frame). Otherwise keep the
+        # detections with the frame, and get_frame_jpeg annotates it if served.
+        watched = time.monotonic() - self._last_view_time < VIEWER_IDLE_TIMEOUT
+        annotation = (detections_sv, result.names, class_ids, confidences)
+        if watched or (self.recording_manager and len(detections_sv)):
+            annotated_frame = self._annotate(frame, *annotation)
+            self._unannotated = None
+        else:
+            annotated_frame = frame
+            self._unannotated = (frame, annotation)
         
         # Calculate max confidence for recording trigger
-        max_conf = float(detections_sv.confidence.max()) if len(detections_sv) > 0 else 0
+        max_conf = max(confidences, default=0)
         
-        # Trigger recording if we have detections and a recording manager
-        if detections_list and self.recording_manager and max_conf > 0:
+        # Trigger recording if we have detections and a recording manager. Only
+        # this path needs the legacy per-object dicts, so build them here.
+        if len(detections_sv) and self.recording_manager and max_conf > 0:
             self.recording_manager.handle_detection(
                 self.detector_id, 
-                detections_list, 
+                self._sv_to_legacy_format(detections_sv, result.names), 
                 max_conf, 
-                annotated_frame.copy()
+                annotated_frame
+            )
+        
+        return annotated_frame, detections_sv
+    
+    def _annotate(self, frame: np.ndarray, detections_sv: sv.Detections, class_names: Dict,
+                  class_ids: List[int], confidences: List[float]) -> np.ndarray:
+        """Draw boxes, labels and the FPS overlay on a frame."""
+        # The capture thread hands over a freshly allocated frame per iteration;
+        # it is only shared with the recording buffer, so copy just the frames
+        # that are annotated and only when recording is active.
+        annotated_frame = frame.copy() if self.recording_manager else frame
+        if len(detections_sv):
+            # Build labels for each detection
+            labels = [
+                f"{class_names[class_id]} {confidence:.2f}"
+                for class_id, confidence in zip(class_ids, confidences)
+            ]
+            # Both annotators draw with a handful of OpenCV calls per box; skip
+            # them entirely on empty frames
+            annotated_frame = self.box_annotator.annotate(
+                scene=annotated_frame,
+                detections=detections_sv
+            )
+            annotated_frame = self.label_annotator.annotate(
+                scene=annotated_frame,
+                detections=detections_sv,
+                labels=labels
             )
         
-        return annotated_frame, detections_list
+        # Add FPS overlay
+        fps_text = f"FPS: {self.fps}"
+        cv2.putText(annotated_frame, fps_text, (10, 30), 
+                    cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 255), 2)
+        return annotated_frame
     
     def _apply_filters(self, detections: sv.Detections, class_names: Dict) -> sv.Detections:
         """Apply configured filters to detections using Supervision's native filtering.
@@ -321,12 +1064,14 @@ class RTSPObjectDetector:
         
         # Filter by class if specified in config
         if self.config.filter_classes:
-            # Get class IDs for the specified class names
-            allowed_class_ids = [
-                class_id for class_id, name in class_names.items() 
-                if name in self.config.filter_classes
-            ]
-            if allowed_class_ids:
+            # Class IDs for the specified names, resolved once per model
+            if self._allowed_class_ids is None:
+                wanted = set(self.config.filter_classes)
+                self._allowed_class_ids = np.array(
+                    [class_id for class_id, name in class_names.items() if name in wanted], dtype=int
+                )
+            allowed_class_ids = self._allowed_class_ids
+            if len(allowed_class_ids):
                 detections = detections[np.isin(detections.class_id, allowed_class_ids)]
         
         # Filter by minimum area if specified
@@ -349,42 +1094,88 @@ class RTSPObjectDetector:
         Returns:
             List of detection dictionaries in legacy format
         """
-        detections = []
-        for i in range(len(detections_sv)):
-            x1, y1, x2, y2 = detections_sv.xyxy[i]
-            detection = {
-                "class": class_names[detections_sv.class_id[i]],
-                "confidence": float(detections_sv.confidence[i]),
-                "bbox": [int(x1), int(y1), int(x2), int(y2)]
+        if len(detections_sv) == 0:
+            return []
+        
+        # Convert whole arrays at once rather than indexing NumPy per box
+        boxes = detections_sv.xyxy.astype(np.int32).tolist()
+        class_ids = detections_sv.class_id.tolist()
+        confidences = detections_sv.confidence.tolist()
+        return [
+            {
+                "class": class_names[class_id],
+                "confidence": confidence,
+                "bbox": bbox
             }
-            detections.append(detection)
-        return detections
+            for bbox, class_id, confidence in zip(boxes, class_ids, confidences)
+        ]
+        
+    def mark_viewed(self) -> None:
+        """Record a preview request, which keeps frames annotated for a while."""
+        self._last_view_time = time.monotonic()
         
     def get_frame_jpeg(self) -> bytes:
-        """Get the latest processed frame as JPEG bytes."""
-        if self.latest_frame is None:
-            # Return a blank frame
-            blank = np.zeros((self.resolution[1], self.resolution[0], 3), dtype=np.uint8)
-            _, buffer = cv2.imencode('.jpg', blank)
-            return buffer.tobytes()
-            
-        _, buffer = cv2.imencode('.jpg', self.latest_frame)
-        return buffer.tobytes()
+        """Get the latest processed frame as JPEG bytes.
+        
+        A frame processed while nobody was watching is annotated here, so the
+        first view after an idle period still shows its detections.
+        """
+        self.mark_viewed()
+        frame = self.latest_frame
+        
+        # Clients polling faster than detection get the already encoded frame
+        source, encoded = self._jpeg_cache
+        if source is frame and encoded:
+            return encoded
+        
+        # Only one concurrent poll encodes a new frame; the rest reuse it
+        with self._jpeg_lock:
+            source, encoded = self._jpeg_cache
+            if source is frame and encoded:
+                return encoded
+            if frame is None:
+                # Blank frame until the first detection result, encoded once
+                blank = np.zeros((self.resolution[1], self.resolution[0], 3), dtype=np.uint8)
+                _, buffer = cv2.imencode('.jpg', blank)
+                encoded = buffer.tobytes()
+            else:
+                image = frame
+                unannotated = self._unannotated
+                if unannotated is not None and unannotated[0] is frame:
+                    image = self._annotate(frame, *unannotated[1])
+                encoded = encode_jpeg(image, self.config.jpeg_quality)
+            # Keyed by the published frame, annotated here or not
+            self._jpeg_cache = (frame, encoded)
+        return encoded
         
     def get_status(self) -> Dict:
         """Get detector status information."""
         return {
             "running": self.running,
             "fps": self.fps,
-            "source": self._mask_credentials(self.source_url),
+            "source": self._masked_url,
+            "secure": self.secure,
             "model": self.model_path,
             "resolution": self.resolution,
             "detections": len(self.detections),
-            "buffer_usage": self.frame_buffer.qsize() / self.buffer_size
+            "buffer_usage": 1.0 if self._frame_ready.is_set() else 0.0,
+            "avg_fps": round(sum(self.fps_history) / len(self.fps_history), 1) if self.fps_history else 0,
+            "frames_captured": self.frames_captured,
+            "frames_processed": self.frames_processed,
+            "frames_dropped": self.frames_dropped
         }
         
     def get_name(self) -> str:
         """Get a human-friendly name for this detector."""
+        return self._name
+        
+    @property
+    def masked_url(self) -> str:
+        """Source URL with credentials masked, safe to log or display."""
+        return self._masked_url
+        
+    def _compute_name(self) -> str:
+        """Derive the detector name from the stream URL."""
         if '@' in self.source_url:
             # Extract path from URL (after credentials and host)
             path = self.source_url.split('@')[-1].split('/')[-1]
@@ -400,9 +1191,9 @@ class DetectorManager:
         self.detectors = {}
         self.default_detector_id = None
         self.model_cache = {}
+        self.inference_workers = {}  # model cache key -> BatchInferenceWorker
         self.recording_manager = recording_manager
-        # Use a thread pool for sharing across detectors
-        self.executor = ThreadPoolExecutor(max_workers=3)
+        self.version = 0  # Bumped whenever detectors are added or removed
         self._lock = threading.RLock()
         
     def add_detector(self, 
@@ -425,15 +1216,7 @@ class DetectorManager:
         if config is None:
             config = DetectorConfig()
         
-        # Resolve model path to use package models directory
-        resolved_model_path = resolve_model_path(config.model_path)
-        
-        # Reuse model if already loaded
-        if resolved_model_path not in self.model_cache:
-            # Show model loading only once
-            logger.info(f"Loading model {resolved_model_path} for the first time")
-            model = YOLO(resolved_model_path)
-            self.model_cache[resolved_model_path] = model
+        worker = self._get_inference_worker(config, source_url)
         
         with self._lock:
             detector = RTSPObjectDetector(
@@ -442,14 +1225,12 @@ class DetectorManager:
                 recording_manager=self.recording_manager if enable_recording else None
             )
             
-            # Set model directly if already loaded
-            if resolved_model_path in self.model_cache:
-                detector.model = self.model_cache[resolved_model_path]
-            else:
-                detector.load_model()
+            # The worker is the only caller of the shared model
+            detector.inference_worker = worker
             
             detector.start()
             self.detectors[detector_id] = detector
+            self.version += 1
             
             # Set as default if it's the first one
             if self.default_detector_id is None:
@@ -459,6 +1240,52 @@ class DetectorManager:
         # logger.info(f"Added detector {detector_id} for stream {detector.get_name()}")
         return detector_id
     
+    def _get_inference_worker(self, config: DetectorConfig, source_url: Optional[str] = None) -> BatchInferenceWorker:
+        """Get the inference worker for a config, loading its model if needed.
+        
+        With ``engine: tensorrt``, ``.pt`` checkpoints are exported once to a
+        TensorRT engine and the engine is loaded instead. Each loaded model is
+        owned by one BatchInferenceWorker, which is its sole caller, so
+        Ultralytics' non-thread-safe predictor is never used concurrently.
+        
+        Args:
+            config: DetectorConfig describing the model and backend
+            source_url: Stream used for INT8 calibration frames, if needed
+        
+        Returns:
+            The batch inference worker shared by detectors using this model
+        """
+        # Resolve model path to use package models directory
+        model_path = resolve_model_path(config.model_path)
+        
+        use_tensorrt = config.engine == "tensorrt" and model_path.endswith(".pt")
+        if use_tensorrt:
+            precision = tensorrt_precision(config)
+            cache_key = (model_path, tuple(config.resolution), config.max_batch, precision)
+        else:
+            cache_key = model_path
+        
+        with self._lock:
+            if cache_key not in self.model_cache:
+                if use_tensorrt:
+                    model_path = export_tensorrt_engine(model_path, config, source_url) or model_path
+                # Show model loading only once
+                logger.info(f"Loading model {model_path} for the first time")
+                self.model_cache[cache_key] = YOLO(model_path, task="detect")
+            if cache_key not in self.inference_workers:
+                worker = BatchInferenceWorker(
+                    self.model_cache[cache_key],
+                    max_batch=config.max_batch,
+                    batch_timeout=config.batch_timeout_ms / 1000.0,
+                    half=config.half,
+                    # Feed engines at the size they were built for
+                    imgsz=inference_size(config) if use_tensorrt else 640,
+                    result_timeout=config.inference_timeout
+                )
+                worker.start()
+                self.inference_workers[cache_key] = worker
+            return self.inference_workers[cache_key]
+    
     def remove_detector(self, detector_id: str) -> bool:
         """Remove a detector by ID.
         
@@ -475,6 +1302,7 @@ class DetectorManager:
             detector = self.detectors[detector_id]
             detector.stop()
             del self.detectors[detector_id]
+            self.version += 1
             
             # Update default if needed
             if detector_id == self.default_detector_id:
@@ -553,9 +1381,12 @@ class DetectorManager:
                     logger.error(f"Error stopping detector {detector_id}: {e}")
             self.detectors.clear()
             self.default_detector_id = None
-        
-        # Shutdown thread pool
-        self.executor.shutdown(wait=True)
+            self.version += 1
+            
+            # Stop shared inference workers once no detector feeds them
+            for worker in self.inference_workers.values():
+                worker.stop()
+            self.inference_workers.clear()
         
         # Stop recording manager if available
         if self.recording_manager:
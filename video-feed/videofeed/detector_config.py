@@ -89,8 +89,22 @@ class DetectorConfig:
     
     # Stream settings
     resolution: Tuple[int, int] = (960, 540)
-    buffer_size: int = 10
+    buffer_size: int = 10  # Deprecated: detection always uses the newest frame
     reconnect_interval: int = 5
+    gpu_decode: bool = True  # Decode/resize with cv2.cudacodec when OpenCV has CUDA
+    motion_gate: bool = False  # Skip inference on frames without motion
+    motion_threshold: float = 0.002  # Fraction of changed pixels that counts as motion
+    motion_max_skip: int = 30  # Run inference at least every N frames anyway
+    jpeg_quality: int = 80  # Dashboard preview JPEG quality (1-100)
+    
+    # Inference backend settings
+    engine: str = "pytorch"  # "pytorch" or "tensorrt" (exported once, cached on disk)
+    half: bool = True  # FP16 inference on CUDA (compute 7.0+) and FP16 TensorRT engines
+    int8: bool = False  # Build INT8 TensorRT engines (requires calibration_data)
+    calibration_data: Optional[str] = None  # Dataset YAML for INT8 calibration, or "auto" to sample the stream
+    max_batch: int = 8  # Largest batch an exported engine accepts
+    batch_timeout_ms: float = 5.0  # How long to wait for more streams' frames per batch
+    inference_timeout: float = 5.0  # Seconds a detector waits for its batched result (after warm-up)
     
     # Filtering settings
     min_detection_area: Optional[int] = None  # Minimum area in pixels
@@ -116,6 +130,9 @@ class DetectorConfig:
         # Get stream settings
         stream_config = detection_config.get('stream', {})
         
+        # Get inference backend settings
+        inference_config = detection_config.get('inference', {})
+        
         # Get filter settings
         filter_config = detection_config.get('filters', {})
         filter_classes = filter_config.get('classes', [])
@@ -133,6 +150,18 @@ class DetectorConfig:
             resolution=tuple(detection_config.get('resolution', {}).values()) or (960, 540),
             buffer_size=stream_config.get('buffer_size', 10),
             reconnect_interval=stream_config.get('reconnect_interval', 5),
+            gpu_decode=stream_config.get('gpu_decode', True),
+            motion_gate=stream_config.get('motion_gate', False),
+            motion_threshold=stream_config.get('motion_threshold', 0.002),
+            motion_max_skip=stream_config.get('motion_max_skip', 30),
+            jpeg_quality=stream_config.get('jpeg_quality', 80),
+            engine=inference_config.get('engine', 'pytorch'),
+            half=inference_config.get('half', True),
+            int8=inference_config.get('int8', False),
+            calibration_data=inference_config.get('calibration_data'),
+            max_batch=inference_config.get('max_batch', 8),
+            batch_timeout_ms=inference_config.get('batch_timeout_ms', 5.0),
+            inference_timeout=inference_config.get('inference_timeout', 5.0),
             filter_classes=filter_classes,
             min_detection_area=filter_config.get('min_area'),
             max_detection_area=filter_config.get('max_area'),
@@ -1,6 +1,7 @@
 """Video recording and database management for video-feed."""
 
 import os
+import re
 import time
 import json
 import logging
@@ -10,14 +11,39 @@ import queue
 import cv2
 import numpy as np
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
-from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+
+# Optional faster JSON encoder for detected-object metadata
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, 
                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger('video-recorder')
 
+# GStreamer H.264 encoders tried in order: NVENC, VA-API (Intel/AMD), V4L2 (Jetson/Raspberry Pi)
+HW_H264_ENCODERS = ("nvh264enc bitrate=4000", "vaapih264enc bitrate=4000", "v4l2h264enc")
+
+
+def _dumps_objects(objects: List[Dict]) -> str:
+    """Serialize detected objects for the objects_detected column."""
+    if orjson is not None:
+        return orjson.dumps(objects, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    return json.dumps(objects, default=float)
+
+
+def _gstreamer_available() -> bool:
+    """Check whether OpenCV was built with the GStreamer backend."""
+    try:
+        return re.search(r"GStreamer:\s*YES", cv2.getBuildInformation()) is not None
+    except Exception:
+        return False
+
+
 class RecordingManager:
     """Manage video recordings and database operations."""
     
@@ -31,7 +57,10 @@ class RecordingManager:
         target_fps: int = 30,               # Target FPS for recordings
         codec: str = 'mp4v',                # Video codec (mp4v is widely compatible)
         max_storage_gb: float = 10.0,       # Max storage in GB before cleanup
-        record_objects: List[str] = []      # List of object classes to record (empty means all)
+        record_objects: List[str] = [],     # List of object classes to record (empty means all)
+        hw_encode: bool = True,             # Encode on the GPU via GStreamer when available
+        yuv_buffer: bool = False,           # Keep pre-detection frames as I420 (half the memory)
+        pre_buffer_fps: Optional[float] = None  # Frame rate kept in the pre-detection buffer (None = all)
     ):
         """Initialize the recording manager.
         
@@ -43,6 +72,11 @@ class RecordingManager:
             fps: Target FPS for recordings
             codec: Video codec to use
             max_storage_gb: Maximum storage space in gigabytes
+            hw_encode: Try hardware H.264 encoders before the software codec
+            yuv_buffer: Store pre-detection frames as YUV420 (I420), trading a
+                color conversion per frame for half the buffer memory
+            pre_buffer_fps: Keep at most this many frames per second in the
+                pre-detection buffer; replayed frames are repeated to fill the gaps
         """
         # Set up paths - ensure proper expansion of ~ to home directory
         if recordings_dir:
@@ -69,6 +103,10 @@ class RecordingManager:
         self.fourcc = cv2.VideoWriter_fourcc(*codec)
         self.max_storage_bytes = max_storage_gb * 1024 * 1024 * 1024  # Convert GB to bytes
         self.record_objects = [obj.lower() for obj in record_objects]  # Store lowercase for case-insensitive matching
+        self.hw_encode = hw_encode
+        self._hw_encoder = None  # Hardware encoder found by start(), None for software
+        self.yuv_buffer = yuv_buffer
+        self.pre_buffer_fps = pre_buffer_fps
         
         # Runtime state
         self.frame_buffers = {}  # Dict of stream_id -> deque of (timestamp, frame) tuples
@@ -78,6 +116,11 @@ class RecordingManager:
         self._lock = threading.RLock()
         self.running = False
         self.cleanup_thread = None
+        self._io_queue = queue.Queue()  # (frame, path) thumbnails waiting to be written
+        self._io_thread = None
+        self._watchdog_thread = None  # Finalizes recordings after the post-detection buffer
+        self.storage_bytes = 0  # Running total of bytes under recordings_dir
+        self._storage_lock = threading.Lock()
         
         # Initialize database
         self._init_database()
@@ -85,9 +128,19 @@ class RecordingManager:
     def _init_database(self):
         """Initialize the SQLite database."""
         try:
-            self.db_conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            # A standalone RecordingsAPI may hold the file too; wait for its
+            # locks instead of failing with "database is locked"
+            self.db_conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30.0)
             cursor = self.db_conn.cursor()
             
+            # WAL with synchronous=NORMAL avoids an fsync per commit, so closing a
+            # recording doesn't stall on disk while holding the lock
+            cursor.execute('PRAGMA journal_mode=WAL')
+            cursor.execute('PRAGMA synchronous=NORMAL')
+            cursor.execute('PRAGMA temp_store=MEMORY')
+            # Dashboard queries read pages through the mmap instead of read() calls
+            cursor.execute('PRAGMA mmap_size=268435456')
+            
             # Create recordings table if it doesn't exist
             cursor.execute('''
             CREATE TABLE IF NOT EXISTS recordings (
@@ -107,6 +160,9 @@ class RecordingManager:
             # Create indexes for faster queries
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_recordings_timestamp ON recordings(timestamp)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_recordings_stream_id ON recordings(stream_id)')
+            # Per-stream listings filter on stream_id/retained and page by timestamp,
+            # so this index serves them without a separate sort step
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_recordings_stream_ts ON recordings(stream_id, retained, timestamp)')
             
             self.db_conn.commit()
             # Silent - shown in main status display
@@ -121,8 +177,15 @@ class RecordingManager:
             return
             
         self.running = True
+        self.storage_bytes = self._scan_storage_size()
+        if self.hw_encode and self._hw_encoder is None:
+            self._hw_encoder = self._probe_hw_encoder()
         self.cleanup_thread = threading.Thread(target=self._storage_cleanup_loop, daemon=True)
         self.cleanup_thread.start()
+        self._io_thread = threading.Thread(target=self._io_loop, daemon=True)
+        self._io_thread.start()
+        self._watchdog_thread = threading.Thread(target=self._watchdog_loop, daemon=True)
+        self._watchdog_thread.start()
         # Silent - shown in main status display
         # logger.info("Recording manager started")
         
@@ -133,11 +196,19 @@ class RecordingManager:
         
         if self.cleanup_thread and self.cleanup_thread.is_alive():
             self.cleanup_thread.join(timeout=2.0)
+        if self._watchdog_thread and self._watchdog_thread.is_alive():
+            self._watchdog_thread.join(timeout=2.0)
             
         # Finalize any active recordings
         with self._lock:
-            for recording_id, info in list(self.active_recordings.items()):
-                self._finalize_recording(recording_id)
+            recording_ids = list(self.active_recordings)
+        for recording_id in recording_ids:
+            self._finalize_recording(recording_id)
+        
+        # Let pending thumbnails reach the disk
+        if self._io_thread and self._io_thread.is_alive():
+            self._io_queue.put(None)
+            self._io_thread.join(timeout=5.0)
                 
         # Close database connection
         if self.db_conn:
@@ -157,19 +228,20 @@ class RecordingManager:
         
         with self._lock:
             # Start with estimated buffer size, will adjust based on actual FPS
-            estimated_buffer_size = self.pre_detection_buffer * self.target_fps
+            estimated_buffer_size = int(self.pre_detection_buffer * self._buffered_fps(self.target_fps))
             self.frame_buffers[stream_id] = {
                 'buffer': deque(maxlen=estimated_buffer_size),
                 'name': stream_name,
                 'last_recording': 0,
                 'recording_in_progress': False,
+                'recording_id': None,  # Active recording fed by add_frame
+                'frame_lock': threading.Lock(),  # Guards this stream's writer
                 'last_detection_time': 0,
-                'timer_lock': threading.Lock(),
-                'cooldown_timer': None,
                 'frame_count': 0,
                 'fps_start_time': time.time(),
                 'actual_fps': self.target_fps,
-                'last_fps_update': time.time()
+                'last_fps_update': time.time(),
+                'last_buffered_time': 0.0
             }
             # Initialize FPS tracking
             self.stream_fps[stream_id] = self.target_fps
@@ -192,62 +264,82 @@ class RecordingManager:
         
         Args:
             stream_id: Stream ID
-            frame: Video frame (numpy array)
+            frame: Video frame (numpy array). The frame is buffered without
+                copying, so callers must not modify it afterwards.
             timestamp: Frame timestamp (defaults to current time)
         """
         if timestamp is None:
             timestamp = time.time()
-            
-        with self._lock:
-            if stream_id not in self.frame_buffers:
-                return
+        
+        # Each stream has a single capture thread feeding it, so buffering needs
+        # no lock; the stream's own lock is only taken while a recording is active
+        stream_info = self.frame_buffers.get(stream_id)
+        if stream_info is None:
+            return
+        
+        # Update FPS calculation
+        stream_info['frame_count'] += 1
+        current_time = time.time()
+        
+        # Calculate actual FPS every 5 seconds
+        if current_time - stream_info['last_fps_update'] >= 5.0:
+            time_elapsed = current_time - stream_info['fps_start_time']
+            if time_elapsed > 0:
+                actual_fps = stream_info['frame_count'] / time_elapsed
+                stream_info['actual_fps'] = actual_fps
+                self.stream_fps[stream_id] = actual_fps
                 
-            stream_info = self.frame_buffers[stream_id]
-            
-            # Update FPS calculation
-            stream_info['frame_count'] += 1
-            current_time = time.time()
-            
-            # Calculate actual FPS every 5 seconds
-            if current_time - stream_info['last_fps_update'] >= 5.0:
-                time_elapsed = current_time - stream_info['fps_start_time']
-                if time_elapsed > 0:
-                    actual_fps = stream_info['frame_count'] / time_elapsed
-                    stream_info['actual_fps'] = actual_fps
-                    self.stream_fps[stream_id] = actual_fps
-                    
-                    # Adjust buffer size based on actual FPS
-                    new_buffer_size = int(self.pre_detection_buffer * actual_fps)
-                    if new_buffer_size != stream_info['buffer'].maxlen:
-                        # Create new buffer with correct size
-                        from collections import deque
-                        old_buffer = list(stream_info['buffer'])
-                        stream_info['buffer'] = deque(old_buffer[-new_buffer_size:], maxlen=new_buffer_size)
-                        logger.info(f"Adjusted buffer size for {stream_id}: {new_buffer_size} frames (FPS: {actual_fps:.1f})")
+                # Adjust buffer size based on actual FPS
+                new_buffer_size = int(self.pre_detection_buffer * self._buffered_fps(actual_fps))
+                if new_buffer_size != stream_info['buffer'].maxlen:
+                    # Create new buffer with correct size
+                    from collections import deque
+                    old_buffer = list(stream_info['buffer'])
+                    stream_info['buffer'] = deque(old_buffer[-new_buffer_size:], maxlen=new_buffer_size)
+                    logger.info(f"Adjusted buffer size for {stream_id}: {new_buffer_size} frames (FPS: {actual_fps:.1f})")
+                
+                # Reset counters
+                stream_info['frame_count'] = 0
+                stream_info['fps_start_time'] = current_time
+                stream_info['last_fps_update'] = current_time
+        
+        # Frames are handed over, not shared, so keep a reference instead of a copy.
+        # I420 needs even dimensions; other frames are buffered as BGR
+        if self.pre_buffer_fps and timestamp - stream_info['last_buffered_time'] < 1.0 / self.pre_buffer_fps:
+            pass  # Subsampled out of the pre-detection buffer
+        elif self.yuv_buffer and frame.shape[0] % 2 == 0 and frame.shape[1] % 2 == 0:
+            stream_info['buffer'].append((timestamp, cv2.cvtColor(frame, cv2.COLOR_BGR2YUV_I420)))
+            stream_info['last_buffered_time'] = timestamp
+        else:
+            stream_info['buffer'].append((timestamp, frame))
+            stream_info['last_buffered_time'] = timestamp
+        
+        if not stream_info['recording_in_progress']:
+            return
+        
+        # If we're currently recording for this stream, add the frame to the
+        # recording. Only this stream's lock is taken, so cameras don't contend
+        failed_recording = None
+        with stream_info['frame_lock']:
+            recording_id = stream_info['recording_id']
+            recording = self.active_recordings.get(recording_id)
+            # Skip frames already written from the pre-detection buffer
+            if recording is not None and timestamp > recording['last_frame_time']:
+                try:
+                    recording['writer'].write(frame)
+                    recording['frame_count'] += 1
                     
-                    # Reset counters
-                    stream_info['frame_count'] = 0
-                    stream_info['fps_start_time'] = current_time
-                    stream_info['last_fps_update'] = current_time
-            
-            # Make a copy of the frame to avoid reference issues
-            stream_info['buffer'].append((timestamp, frame.copy()))
+                    # Update last frame time
+                    recording['last_frame_time'] = timestamp
+                except Exception as e:
+                    logger.error(f"Error writing frame to recording {recording_id}: {e}")
+                    failed_recording = recording_id
+        
+        # If writing fails, finalize the recording (outside the stream lock,
+        # which is always taken after the shared lock)
+        if failed_recording is not None:
+            self._finalize_recording(failed_recording)
             
-            # If we're currently recording for this stream, add the frame to the recording
-            if stream_info['recording_in_progress']:
-                for recording_id, recording in list(self.active_recordings.items()):
-                    if recording['stream_id'] == stream_id:
-                        try:
-                            recording['writer'].write(frame.copy())
-                            recording['frame_count'] += 1
-                            
-                            # Update last frame time
-                            recording['last_frame_time'] = timestamp
-                        except Exception as e:
-                            logger.error(f"Error writing frame to recording {recording_id}: {e}")
-                            # If writing fails, finalize the recording
-                            self._finalize_recording(recording_id)
-                
     def handle_detection(self, stream_id: str, objects: List[Dict], confidence: float, frame: np.ndarray):
         """Handle an object detection event and possibly start or continue recording.
         
@@ -286,6 +378,21 @@ class RecordingManager:
             objects = filtered_objects
             
         current_time = time.time()
+        
+        stream_info = self.frame_buffers.get(stream_id)
+        if stream_info is None:
+            return
+        
+        # Fast path: extending an ongoing recording is two float stores, which
+        # are atomic under the GIL, so it doesn't need the shared lock
+        recording = self.active_recordings.get(stream_info['recording_id'])
+        if recording is not None:
+            stream_info['last_detection_time'] = current_time
+            recording['last_detection_time'] = current_time
+            return
+        
+        # This detection may start a recording; serialize while not holding the lock
+        objects_json = _dumps_objects(objects)
             
         with self._lock:
             # Check if stream is registered
@@ -297,224 +404,255 @@ class RecordingManager:
             # Update the last detection time
             stream_info['last_detection_time'] = current_time
             
-            # If we're already recording, just update the detection time and cancel any cooldown timer
+            # If a recording started since the unlocked check, just update the detection time
             if stream_info['recording_in_progress']:
-                # Find the active recording for this stream
-                for recording_id, recording in list(self.active_recordings.items()):
-                    if recording['stream_id'] == stream_id:
-                        # Update the detection time in the recording
-                        recording['last_detection_time'] = current_time
-                        
-                        # Cancel any cooldown timer
-                        if stream_info['cooldown_timer'] is not None:
-                            stream_info['cooldown_timer'].cancel()
-                            stream_info['cooldown_timer'] = None
-                            #logger.info(f"Canceled cooldown timer for stream {stream_id} due to new detection")
-                            
-                        # Start a new cooldown timer
-                        self._start_cooldown_timer(stream_id, recording_id)
-                       # logger.info(f"Reset cooldown timer for ongoing recording due to new detection")
-                        break
-                        
+                recording = self.active_recordings.get(stream_info['recording_id'])
+                if recording is not None:
+                    # The watchdog finalizes it once this stops being refreshed
+                    recording['last_detection_time'] = current_time
                 return
             
             # Avoid starting too many recordings (minimum 5 seconds between recordings)
             if current_time - stream_info['last_recording'] < 5:
                 return
-                
-            # Create a unique identifier for this recording
-            recording_id = f"{stream_id}_{int(current_time * 1000)}"
-            
-            # Start a new recording
-            detection_timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-            video_filename = f"{stream_info['name']}_{detection_timestamp}.mp4"
-            video_path = str(self.recordings_dir / video_filename)
-            
-            # Save thumbnail
-            thumbnail_filename = f"{stream_info['name']}_{detection_timestamp}_thumb.jpg"
-            thumbnail_path = str(self.recordings_dir / thumbnail_filename)
-            self._save_thumbnail(frame, thumbnail_path)
             
-            # Get frame dimensions
-            height, width = frame.shape[:2]
+            # Claim the start; the writer is opened without holding the lock
+            stream_info['last_recording'] = current_time
+            stream_name = stream_info['name']
             
             # Use actual FPS for this stream
             actual_fps = self.stream_fps.get(stream_id, self.target_fps)
-            
-            # Create a video writer with actual FPS
-            writer = cv2.VideoWriter(
-                video_path, 
-                self.fourcc, 
-                actual_fps, 
-                (width, height)
-            )
-            
-            if not writer.isOpened():
-                logger.error(f"Failed to open video writer for {video_path}")
+        
+        # Create a unique identifier for this recording
+        recording_id = f"{stream_id}_{int(current_time * 1000)}"
+        
+        # Start a new recording
+        detection_timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        video_filename = f"{stream_name}_{detection_timestamp}.mp4"
+        video_path = str(self.recordings_dir / video_filename)
+        
+        # Save thumbnail
+        thumbnail_filename = f"{stream_name}_{detection_timestamp}_thumb.jpg"
+        thumbnail_path = str(self.recordings_dir / thumbnail_filename)
+        self._save_thumbnail(frame, thumbnail_path)
+        
+        # Get frame dimensions
+        height, width = frame.shape[:2]
+        
+        # Opening the writer builds an encoder pipeline, so other cameras
+        # keep buffering and recording meanwhile
+        writer = self._open_writer(video_path, actual_fps, (width, height))
+        
+        if not writer.isOpened():
+            logger.error(f"Failed to open video writer for {video_path}")
+            return
+        
+        with self._lock:
+            # The stream may have been unregistered while the writer opened
+            if self.frame_buffers.get(stream_id) is not stream_info:
+                writer.release()
                 return
             
-            # Write buffered frames (pre-detection footage)
-            buffer_frames_written = 0
-            for ts, buffered_frame in list(stream_info['buffer']):
-                if buffered_frame is not None:
-                    try:
-                        writer.write(buffered_frame)
-                        buffer_frames_written += 1
-                    except Exception as e:
-                        logger.error(f"Error writing buffered frame: {e}")
-            
-            logger.info(f"Wrote {buffer_frames_written} buffered frames to recording {recording_id}")
-            
-            # Update stream info
+            # Register the recording before snapshotting the buffer, so a frame
+            # add_frame appends concurrently (without any lock) is either in the
+            # snapshot or written by add_frame after the replay below. The stream
+            # lock stays held until the replay is done; only the shared lock is
+            # released, so other cameras aren't blocked by the encode work
+            frame_lock = stream_info['frame_lock']
+            frame_lock.acquire()
             stream_info['recording_in_progress'] = True
-            stream_info['last_recording'] = current_time
-            
-            # Add current detection frame
-            writer.write(frame)
+            buffered = list(stream_info['buffer'])
+            last_buffered_time = buffered[-1][0] if buffered else current_time
             
             # Store recording information
             self.active_recordings[recording_id] = {
                 'stream_id': stream_id,
-                'stream_name': stream_info['name'],
+                'stream_name': stream_name,
                 'start_time': current_time,
                 'last_detection_time': current_time,
-                'last_frame_time': current_time,
+                'last_frame_time': last_buffered_time,
                 'writer': writer,
                 'file_path': video_path,
                 'thumbnail_path': thumbnail_path,
-                'frame_count': len(stream_info['buffer']),
-                'objects': objects,
+                'frame_count': len(buffered),
+                'objects_json': objects_json,
                 'confidence': confidence
             }
+            stream_info['recording_id'] = recording_id
             
-            # We don't set a timer to finalize immediately - recording will continue
-            # until no more detections occur for post_detection_buffer seconds
-            
-            # Log the event
-            class_names = [obj['class'] for obj in objects]
-            logger.info(f"Started recording {recording_id} due to detection: {class_names}")
+        try:
+            # Write buffered frames (pre-detection footage)
+            buffer_frames_written = 0
+            # Subsampled buffers repeat each frame so the pre-roll keeps real-time speed
+            repeats = max(1, round(actual_fps / self._buffered_fps(actual_fps)))
+            bgr_scratch = None  # Reused for every I420 frame; the writer consumes it synchronously
+            for ts, buffered_frame in buffered:
+                if buffered_frame is not None:
+                    try:
+                        if buffered_frame.ndim == 2:  # Stored as I420
+                            bgr_scratch = cv2.cvtColor(buffered_frame, cv2.COLOR_YUV2BGR_I420, dst=bgr_scratch)
+                            buffered_frame = bgr_scratch
+                        for _ in range(repeats):
+                            writer.write(buffered_frame)
+                        buffer_frames_written += 1
+                    except Exception as e:
+                        logger.error(f"Error writing buffered frame: {e}")
             
-            # Start a cooldown timer that will finalize the recording if no more detections occur
-            self._start_cooldown_timer(stream_id, recording_id)
+            logger.info(f"Wrote {buffer_frames_written} buffered frames to recording {recording_id}")
             
-    def _check_recording_status(self, stream_id: str, recording_id: str):
-        """Check if recording should continue or be finalized based on detection timing.
+            # Add current detection frame
+            writer.write(frame)
+        finally:
+            frame_lock.release()
         
-        Args:
-            stream_id: Stream ID to check
-            recording_id: Recording ID to check
+        # The recording continues until no more detections occur for
+        # post_detection_buffer seconds; the watchdog thread then finalizes it
+        
+        # Log the event
+        class_names = [obj['class'] for obj in objects]
+        logger.info(f"Started recording {recording_id} due to detection: {class_names}")
+            
+    def _buffered_fps(self, stream_fps: float) -> float:
+        """Frame rate the pre-detection buffer actually stores for a stream."""
+        if self.pre_buffer_fps:
+            return min(stream_fps, self.pre_buffer_fps)
+        return stream_fps
+        
+    @staticmethod
+    def _hw_pipeline(encoder: str, path: str) -> str:
+        """GStreamer pipeline writing H.264 from ``encoder`` to ``path``.
+        
+        Fragmented MP4: closing the file doesn't rewrite a moov index, and the
+        footage stays playable if the process dies mid-recording.
         """
-        logger.info(f"Checking recording status for {recording_id} after cooldown period")
-        with self._lock:
-            if stream_id not in self.frame_buffers or recording_id not in self.active_recordings:
-                logger.info(f"Stream or recording no longer exists: {stream_id}/{recording_id}")
-                return
-                
-            stream_info = self.frame_buffers[stream_id]
-            recording = self.active_recordings[recording_id]
-            
-            current_time = time.time()
-            time_since_last_detection = current_time - recording['last_detection_time']
-            
-            logger.info(f"Time since last detection: {time_since_last_detection:.2f}s (buffer: {self.post_detection_buffer}s)")
-            
-            # If it's been long enough since the last detection, finalize the recording
-            if time_since_last_detection >= self.post_detection_buffer:
-                logger.info(f"Finalizing recording {recording_id} after cooldown period")
-                # Clear the cooldown timer reference to prevent memory leaks
-                stream_info['cooldown_timer'] = None
-                # Finalize the recording
-                self._finalize_recording(recording_id)
-            else:
-                # We still have recent detections, so reset the timer
-                logger.info(f"Recent detection found, resetting cooldown timer for {recording_id}")
-                self._start_cooldown_timer(stream_id, recording_id)
-                
-    def _start_cooldown_timer(self, stream_id: str, recording_id: str):
-        """Start a cooldown timer to finalize recording if no more detections occur.
+        return (f'appsrc ! videoconvert ! {encoder} ! h264parse ! '
+                f'mp4mux fragment-duration=1000 streamable=true ! filesink location="{path}"')
         
-        Args:
-            stream_id: Stream ID
-            recording_id: Recording ID
+    def _probe_hw_encoder(self) -> Optional[str]:
+        """Find the first hardware H.264 encoder that opens, once at start.
+        
+        Returns:
+            The encoder element (with options), or None to encode in software
         """
-        with self._lock:
-            if stream_id not in self.frame_buffers:
-                return
-                
-            # Cancel any existing timer
-            stream_info = self.frame_buffers[stream_id]
-            if stream_info['cooldown_timer'] is not None:
-                stream_info['cooldown_timer'].cancel()
-            
-            # Create a new timer
-            timer = threading.Timer(
-                self.post_detection_buffer,
-                self._check_recording_status,
-                args=[stream_id, recording_id]
-            )
-            timer.daemon = True
-            timer.start()
-            
-            # Store the timer
-            stream_info['cooldown_timer'] = timer
-            #logger.info(f"Started cooldown timer for recording {recording_id} ({self.post_detection_buffer}s)")
+        if not _gstreamer_available():
+            return None
+        for encoder in HW_H264_ENCODERS:
+            writer = cv2.VideoWriter(self._hw_pipeline(encoder, os.devnull), cv2.CAP_GSTREAMER,
+                                     0, self.target_fps, (640, 480), True)
+            opened = writer.isOpened()
+            writer.release()
+            if opened:
+                logger.info(f"Encoding recordings with {encoder.split()[0]}")
+                return encoder
+        return None
+        
+    def _open_writer(self, path: str, fps: float, size: Tuple[int, int]) -> cv2.VideoWriter:
+        """Open a video writer, preferring the hardware encoder found at start.
+        
+        Falls back to the software codec when the hardware encoder is busy
+        (e.g. NVENC session limits on consumer GPUs).
+        
+        Args:
+            path: Output file path
+            fps: Recording frame rate
+            size: Frame (width, height)
             
-    def _finalize_recording(self, recording_id: str):
+        Returns:
+            cv2.VideoWriter: The opened (or software fallback) writer
+        """
+        if self._hw_encoder is not None:
+            writer = cv2.VideoWriter(self._hw_pipeline(self._hw_encoder, path), cv2.CAP_GSTREAMER,
+                                     0, fps, size, True)
+            if writer.isOpened():
+                return writer
+            writer.release()
+        return cv2.VideoWriter(path, self.fourcc, fps, size)
+        
+    def _watchdog_loop(self):
+        """Background thread finalizing recordings once detections stop.
+        
+        A recording ends when no detection has extended it for
+        ``post_detection_buffer`` seconds. One thread checks all active
+        recordings instead of a timer thread per detection.
+        """
+        interval = min(1.0, max(0.1, self.post_detection_buffer / 4))
+        while self.running:
+            time.sleep(interval)
+            now = time.time()
+            with self._lock:
+                expired = [recording_id for recording_id, recording in self.active_recordings.items()
+                           if now - recording['last_detection_time'] >= self.post_detection_buffer]
+            # Finalize outside the lock; closing the files can block on disk I/O.
+            # A detection may extend a recording meanwhile, so finalizing
+            # re-checks the cooldown
+            for recording_id in expired:
+                self._finalize_recording(recording_id, expired_only=True)
+                        
+    def _finalize_recording(self, recording_id: str, expired_only: bool = False):
         """Finalize a recording and save to database.
         
         Args:
             recording_id: ID of the recording to finalize
+            expired_only: Only finalize if no detection extended the recording
+                within the last ``post_detection_buffer`` seconds
         """
-        logger.info(f"Finalizing recording {recording_id}")
         with self._lock:
-            if recording_id not in self.active_recordings:
+            recording = self.active_recordings.get(recording_id)
+            if recording is None:
                 return
-                
-            recording = self.active_recordings[recording_id]
+            if expired_only and time.time() - recording['last_detection_time'] < self.post_detection_buffer:
+                return
+            del self.active_recordings[recording_id]
             stream_id = recording['stream_id']
+            stream_info = self.frame_buffers.get(stream_id)
+        
+        logger.info(f"Finalizing recording {recording_id}")
+        
+        # Detach the writer from the stream once add_frame is done with it. The
+        # stream lock is taken after the shared lock is released, so waiting
+        # for this stream's buffer replay doesn't block the other cameras.
+        # Until the flag is cleared, no new recording can start on the stream.
+        if stream_info is not None:
+            with stream_info['frame_lock']:
+                if stream_info['recording_id'] == recording_id:
+                    stream_info['recording_in_progress'] = False
+                    stream_info['recording_id'] = None
+        
+        # Nothing else references the writer now, so close the file without
+        # holding any lock; other streams keep recording meanwhile
+        recording['writer'].release()
+        try:
+            self._add_storage_bytes(os.path.getsize(recording['file_path']))
+        except OSError:
+            pass
+        
+        # Calculate duration
+        end_time = time.time()
+        duration = end_time - recording['start_time']
+        
+        # Save recording to database
+        try:
+            cursor = self.db_conn.cursor()
+            cursor.execute('''
+            INSERT INTO recordings 
+            (timestamp, stream_id, stream_name, file_path, duration, 
+            objects_detected, thumbnail_path, confidence, retained)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1)
+            ''', (
+                datetime.fromtimestamp(recording['start_time']).isoformat(),
+                stream_id,
+                recording['stream_name'],
+                recording['file_path'],
+                duration,
+                recording['objects_json'],
+                recording['thumbnail_path'],
+                recording['confidence']
+            ))
+            self.db_conn.commit()
             
-            # Release the video writer
-            writer = recording['writer']
-            writer.release()
-            
-            # Calculate duration
-            end_time = time.time()
-            duration = end_time - recording['start_time']
-            
-            # Reset stream recording flag
-            if stream_id in self.frame_buffers:
-                self.frame_buffers[stream_id]['recording_in_progress'] = False
-                # Clear any cooldown timer
-                if self.frame_buffers[stream_id]['cooldown_timer'] is not None:
-                    self.frame_buffers[stream_id]['cooldown_timer'].cancel()
-                    self.frame_buffers[stream_id]['cooldown_timer'] = None
-            
-            # Save recording to database
-            try:
-                cursor = self.db_conn.cursor()
-                cursor.execute('''
-                INSERT INTO recordings 
-                (timestamp, stream_id, stream_name, file_path, duration, 
-                objects_detected, thumbnail_path, confidence, retained)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1)
-                ''', (
-                    datetime.fromtimestamp(recording['start_time']).isoformat(),
-                    stream_id,
-                    recording['stream_name'],
-                    recording['file_path'],
-                    duration,
-                    json.dumps(recording['objects']),
-                    recording['thumbnail_path'],
-                    recording['confidence']
-                ))
-                self.db_conn.commit()
-                
-                # Remove from active recordings
-                del self.active_recordings[recording_id]
-                
-                logger.info(f"Finalized recording {recording_id} (duration: {duration:.2f}s, frames: {recording['frame_count']})")
-            except Exception as e:
-                logger.error(f"Failed to save recording {recording_id} to database: {e}")
+            logger.info(f"Finalized recording {recording_id} (duration: {duration:.2f}s, frames: {recording['frame_count']})")
+        except Exception as e:
+            logger.error(f"Failed to save recording {recording_id} to database: {e}")
         
     def get_recording_stats(self) -> Dict:
         """Get statistics about active recordings and buffers.
@@ -549,14 +687,38 @@ class RecordingManager:
     def _save_thumbnail(self, frame: np.ndarray, path: str):
         """Save a thumbnail image from a frame.
         
+        The JPEG encode and disk write happen on the I/O thread, so callers
+        holding the lock don't wait on them. Frames are never modified after
+        being handed over, so no copy is needed.
+        
         Args:
             frame: Frame to save as thumbnail
             path: Path to save thumbnail to
         """
+        if self._io_thread is not None and self._io_thread.is_alive():
+            self._io_queue.put((frame, path))
+        else:
+            self._write_thumbnail(frame, path)
+            
+    def _write_thumbnail(self, frame: np.ndarray, path: str):
+        """Encode and write a thumbnail to disk."""
         try:
-            cv2.imwrite(path, frame)
+            ok, buffer = cv2.imencode('.jpg', frame)
+            if not ok:
+                raise ValueError("JPEG encoding failed")
+            with open(path, 'wb') as f:
+                f.write(buffer.tobytes())
+            self._add_storage_bytes(len(buffer))
         except Exception as e:
             logger.error(f"Error saving thumbnail: {e}")
+            
+    def _io_loop(self):
+        """Background thread writing thumbnails off the detection path."""
+        while True:
+            item = self._io_queue.get()
+            if item is None:
+                break
+            self._write_thumbnail(*item)
                 
     def _storage_cleanup_loop(self):
         """Background thread to periodically check storage usage and cleanup if needed."""
@@ -568,7 +730,13 @@ class RecordingManager:
                 if not self.running:
                     break
                     
-                total_size = sum(f.stat().st_size for f in self.recordings_dir.glob('**/*') if f.is_file())
+                # The running total is cheap to check; confirm with a full scan
+                # before deleting, since recordings can be removed elsewhere (API)
+                if self.storage_bytes <= self.max_storage_bytes:
+                    continue
+                total_size = self._scan_storage_size()
+                with self._storage_lock:
+                    self.storage_bytes = total_size
                 
                 # If we're using too much space, delete oldest recordings
                 if total_size > self.max_storage_bytes:
@@ -577,6 +745,30 @@ class RecordingManager:
             except Exception as e:
                 logger.error(f"Error in storage cleanup loop: {e}")
                 
+    def _scan_storage_size(self, path: Optional[str] = None) -> int:
+        """Walk the recordings directory and return its total size in bytes.
+        
+        Uses os.scandir, whose entries carry the file type from the directory
+        read, instead of building a Path and stat-ing every glob match.
+        """
+        total = 0
+        with os.scandir(path or self.recordings_dir) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        total += self._scan_storage_size(entry.path)
+                    elif entry.is_file():
+                        total += entry.stat().st_size
+                except OSError:
+                    # File removed mid-walk (e.g. deleted through the API)
+                    pass
+        return total
+        
+    def _add_storage_bytes(self, delta: int):
+        """Adjust the running storage total."""
+        with self._storage_lock:
+            self.storage_bytes += delta
+            
     def _cleanup_old_recordings(self):
         """Delete oldest recordings to free up space."""
         try:
@@ -590,27 +782,31 @@ class RecordingManager:
             LIMIT 20
             ''')
             
-            for row in cursor.fetchall():
-                rec_id, file_path, thumbnail_path = row
-                
-                # Delete the files
-                try:
-                    if os.path.exists(file_path):
-                        os.remove(file_path)
-                    if thumbnail_path and os.path.exists(thumbnail_path):
-                        os.remove(thumbnail_path)
+            deleted_ids = []
+            try:
+                for row in cursor.fetchall():
+                    rec_id, file_path, thumbnail_path = row
+                    
+                    # Delete the files
+                    try:
+                        for path in (file_path, thumbnail_path):
+                            if path and os.path.exists(path):
+                                size = os.path.getsize(path)
+                                os.remove(path)
+                                self._add_storage_bytes(-size)
+                        deleted_ids.append((rec_id,))
+                        logger.info(f"Deleted old recording: {file_path}")
+                    except Exception as e:
+                        logger.error(f"Error deleting recording {rec_id}: {e}")
                         
-                    # Update database
-                    cursor.execute('UPDATE recordings SET retained = 0 WHERE id = ?', (rec_id,))
+                    # Check if we've freed up enough space
+                    if self.storage_bytes < self.max_storage_bytes * 0.8:  # Stop when we're below 80% of max
+                        break
+            finally:
+                # Mark all deleted recordings in one transaction
+                if deleted_ids:
+                    cursor.executemany('UPDATE recordings SET retained = 0 WHERE id = ?', deleted_ids)
                     self.db_conn.commit()
-                    logger.info(f"Deleted old recording: {file_path}")
-                except Exception as e:
-                    logger.error(f"Error deleting recording {rec_id}: {e}")
-                    
-                # Check if we've freed up enough space
-                total_size = sum(f.stat().st_size for f in self.recordings_dir.glob('**/*') if f.is_file())
-                if total_size < self.max_storage_bytes * 0.8:  # Stop when we're below 80% of max
-                    break
         except Exception as e:
             logger.error(f"Error during recordings cleanup: {e}")
             
@@ -1,5 +1,7 @@
 """Authentication routes."""
 
+import hmac
+
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
@@ -8,6 +10,11 @@ from videofeed.credentials import get_credentials
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
 
+def _matches(supplied: str, expected: str) -> bool:
+    """Compare secrets in constant time."""
+    return hmac.compare_digest(supplied.encode(), expected.encode())
+
+
 class UserCredentials(BaseModel):
     """User credentials for authentication."""
     username: str
@@ -15,12 +22,24 @@ class UserCredentials(BaseModel):
 
 
 @router.post("/verify")
-async def verify_credentials(user_creds: UserCredentials):
-    """Verify if credentials match those in the system keychain."""
+def verify_credentials(user_creds: UserCredentials):
+    """Verify if credentials match those in the system keychain.
+    
+    The keychain is read on every request, so credentials rotated by
+    ``surveillance reset`` apply without a restart. A plain ``def`` keeps the
+    blocking keychain lookup in the threadpool, off the event loop.
+    """
     creds = get_credentials()
     
+    # Compare against both accounts with non-short-circuiting checks so the
+    # response time doesn't depend on which field or account mismatched
+    is_publisher = (_matches(user_creds.username, creds["publish_user"])
+                    & _matches(user_creds.password, creds["publish_pass"]))
+    is_viewer = (_matches(user_creds.username, creds["read_user"])
+                 & _matches(user_creds.password, creds["read_pass"]))
+    
     # Check publisher credentials
-    if user_creds.username == creds["publish_user"] and user_creds.password == creds["publish_pass"]:
+    if is_publisher:
         return {
             "authenticated": True,
             "user_type": "publisher",
@@ -28,7 +47,7 @@ async def verify_credentials(user_creds: UserCredentials):
         }
     
     # Check viewer credentials
-    if user_creds.username == creds["read_user"] and user_creds.password == creds["read_pass"]:
+    if is_viewer:
         return {
             "authenticated": True,
             "user_type": "viewer",
@@ -1,6 +1,9 @@
 """HTML page rendering routes."""
 
 import os
+from functools import lru_cache
+from typing import Optional
+
 from fastapi import APIRouter, Request
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
@@ -11,11 +14,64 @@ router = APIRouter(tags=["pages"])
 templates_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates")
 templates = Jinja2Templates(directory=templates_path)
 
+# Templates ship with the package: compile them once at import and skip
+# Jinja's per-render mtime check
+templates.env.auto_reload = False
+for _name in ("viewer.html", "recordings.html"):
+    templates.get_template(_name)
+
+# Global detector manager reference (set by visualizer)
+detector_manager = None
+
+
+def set_detector_manager(manager):
+    """Set the detector manager instance."""
+    global detector_manager
+    detector_manager = manager
+    _render_viewer.cache_clear()
+
+
+@lru_cache(maxsize=16)
+def _render_viewer(version: int, feed: Optional[str], pull_mode: bool = False) -> bytes:
+    """Render viewer.html for one detector set, selected feed and view mode.
+
+    The page only changes when detectors are added or removed, which bumps
+    ``detector_manager.version``, so renders are cached per version.
+    """
+    feeds = {}
+    active = None
+    active_id = None
+    if detector_manager is not None:
+        for detector_id, detector in detector_manager.get_all_detectors().items():
+            feeds[detector_id] = {
+                "id": detector_id,
+                "name": detector.get_name(),
+                "source": detector.masked_url,
+                "secure": detector.secure
+            }
+        active_id = feed if feed in feeds else detector_manager.default_detector_id
+        active = detector_manager.get_detector(active_id)
+
+    return templates.get_template("viewer.html").render(
+        feeds=feeds,
+        active_feed_id=active_id,
+        active_feed_name=active.get_name() if active else "No active feed",
+        active_feed_source=active.masked_url if active else "",
+        active_feed_secure=active.secure if active else False,
+        model=active.model_path if active else "",
+        pull_mode=pull_mode
+    ).encode()
+
 
 @router.get("/", response_class=HTMLResponse)
-async def index(request: Request):
-    """Render the main viewer page."""
-    return templates.TemplateResponse("viewer.html", {"request": request})
+async def index(feed: Optional[str] = None, fps: Optional[float] = None):
+    """Render the main viewer page.
+
+    A positive ``fps`` selects pull mode: the page polls snapshots at that
+    rate instead of opening the MJPEG stream.
+    """
+    version = detector_manager.version if detector_manager is not None else -1
+    return HTMLResponse(content=_render_viewer(version, feed, fps is not None and fps > 0))
 
 
 @router.get("/recordings.html", response_class=HTMLResponse)
@@ -197,7 +197,7 @@ async def get_recording_detail(recording_id: int):
                 abs_recordings_dir = os.path.abspath(os.path.expanduser(recordings_directory))
                 rel_path = os.path.relpath(abs_file_path, abs_recordings_dir)
                 recording['file_url'] = f"/recordings/{rel_path}"
-                logger.info(f"Created file URL: {recording['file_url']} from {recording['file_path']}")
+                logger.debug(f"Created file URL: {recording['file_url']} from {recording['file_path']}")
             except Exception as e:
                 logger.error(f"Error creating file URL: {e}")
                 recording['file_url'] = None
@@ -209,7 +209,7 @@ async def get_recording_detail(recording_id: int):
                 abs_recordings_dir = os.path.abspath(os.path.expanduser(recordings_directory))
                 rel_path = os.path.relpath(abs_thumb_path, abs_recordings_dir)
                 recording['thumbnail_url'] = f"/recordings/{rel_path}"
-                logger.info(f"Created thumbnail URL: {recording['thumbnail_url']} from {recording['thumbnail_path']}")
+                logger.debug(f"Created thumbnail URL: {recording['thumbnail_url']} from {recording['thumbnail_path']}")
             except Exception as e:
                 logger.error(f"Error creating thumbnail URL: {e}")
                 recording['thumbnail_url'] = None
@@ -1,14 +1,32 @@
 """Video streaming routes."""
 
 import asyncio
-import io
-from typing import Optional
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Optional
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
 
 router = APIRouter(prefix="/video", tags=["video"])
 
+# Resend the current frame this often when no new one arrives, which keeps
+# the connection alive and the detector annotating for this viewer
+FRAME_KEEPALIVE = 1.0
+
+# Dedicated, bounded pool for preview JPEG encodes, so a burst of snapshot
+# requests can't take over the loop's default executor
+ENCODE_POOL = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1),
+                                 thread_name_prefix="jpeg-encode")
+
+# MJPEG part framing around each JPEG
+PART_HEADER = b'--frame\r\nContent-Type: image/jpeg\r\n\r\n'
+PART_TAIL = b'\r\n'
+
+# Active frame broadcasters by detector instance ID
+_broadcasters: Dict[str, "FrameBroadcaster"] = {}
+
 # Global detector manager reference (set by visualizer)
 detector_manager = None
 
@@ -33,31 +51,160 @@ async def video_feed(feed: Optional[str] = None):
 
 
 @router.get("/jpeg/{detector_id}")
-async def video_frame(detector_id: str):
+@router.get("/thumbnail/{detector_id}")
+async def video_frame(detector_id: str, request: Request):
     """Get a single frame as JPEG from a specific detector."""
+    return await _frame_response(detector_id, request)
+
+
+@router.get("/snapshot")
+async def video_snapshot(request: Request, feed: Optional[str] = None):
+    """Get the latest frame of a feed (default feed if omitted) as JPEG.
+    
+    Lets clients on slow links pull frames at their own pace instead of
+    receiving the MJPEG push stream.
+    """
+    return await _frame_response(feed, request)
+
+
+async def _frame_response(detector_id: Optional[str], request: Request) -> Response:
+    """Build a JPEG snapshot response for a detector.
+    
+    Responses carry an ETag for the processed frame, so a client that
+    already holds the current frame gets an empty 304 instead.
+    """
     global detector_manager
     if detector_manager is None:
         raise HTTPException(status_code=503, detail="Detector manager not initialized")
     
-    # Get a single frame as JPEG
-    frame_bytes = detector_manager.get_frame_jpeg(detector_id)
-    return StreamingResponse(content=io.BytesIO(frame_bytes), media_type="image/jpeg")
+    headers = {}
+    detector = detector_manager.get_detector(detector_id)
+    if detector is not None:
+        # Read before encoding, so the body is never older than its tag
+        headers["ETag"] = f'"{detector.detector_id}-{detector.frames_processed}"'
+        headers["Cache-Control"] = "max-age=1, must-revalidate"
+        if request.headers.get("if-none-match") == headers["ETag"]:
+            detector.mark_viewed()
+            return Response(status_code=304, headers=headers)
+    
+    # Encoding can take milliseconds, so keep it off the event loop
+    loop = asyncio.get_running_loop()
+    frame_bytes = await loop.run_in_executor(ENCODE_POOL, detector_manager.get_frame_jpeg, detector_id)
+    return Response(content=frame_bytes, media_type="image/jpeg", headers=headers)
+
+
+class FrameBroadcaster:
+    """Fan one detector's frames out to all of its MJPEG clients.
+    
+    A single task per detector waits for new frames, fetches each JPEG once
+    and hands the framed part to every client's queue. A queue holds one
+    part, and a newer part replaces one not yet sent, so slow clients skip
+    frames instead of falling behind. The task runs only while clients are
+    subscribed.
+    """
+    
+    def __init__(self, detector):
+        """Initialize the broadcaster.
+        
+        Args:
+            detector: RTSPObjectDetector to stream from
+        """
+        self.detector = detector
+        self.queues = set()
+        self.part = None  # Latest framed part, sent to new clients first
+        self.task = None
+        
+    def subscribe(self) -> asyncio.Queue:
+        """Register a client, starting the broadcast task if needed."""
+        queue = asyncio.Queue(maxsize=1)
+        if self.part is not None:
+            queue.put_nowait(self.part)
+        self.queues.add(queue)
+        if self.task is None or self.task.done():
+            self.task = asyncio.get_running_loop().create_task(self._run())
+        return queue
+    
+    def unsubscribe(self, queue: asyncio.Queue) -> bool:
+        """Remove a client; returns True once no clients are left."""
+        self.queues.discard(queue)
+        if self.queues:
+            return False
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+        return True
+    
+    def _publish(self, part: bytes) -> None:
+        """Hand a part to every client, replacing any it has not sent yet."""
+        self.part = part
+        for queue in self.queues:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(part)
+    
+    async def _run(self) -> None:
+        """Publish each new frame until cancelled."""
+        # The processing thread wakes this task through its event loop
+        loop = asyncio.get_running_loop()
+        new_frame = asyncio.Event()
+        notify = partial(loop.call_soon_threadsafe, new_frame.set)
+        self.detector.add_frame_listener(notify)
+        sent = None
+        try:
+            while True:
+                new_frame.clear()
+                # Encode in the thread pool; also marks the detector as watched
+                frame_bytes = await loop.run_in_executor(ENCODE_POOL, self.detector.get_frame_jpeg)
+                
+                # The JPEG cache hands out one bytes object per frame, so a
+                # frame published during the fetch is not sent twice
+                if frame_bytes is not sent:
+                    sent = frame_bytes
+                    # MJPEG part as a single chunk
+                    self._publish(b''.join((PART_HEADER, frame_bytes, PART_TAIL)))
+                
+                try:
+                    await asyncio.wait_for(new_frame.wait(), timeout=FRAME_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self.detector.remove_frame_listener(notify)
 
 
 async def generate_frames(detector_id: Optional[str] = None):
-    """Generate video frames for streaming."""
+    """Generate video frames for streaming.
+    
+    Clients subscribe to the detector's FrameBroadcaster rather than
+    polling on a timer, so each frame is fetched and framed once for all
+    clients and no frame is sent twice. Without new frames the last one is
+    resent every FRAME_KEEPALIVE seconds.
+    """
     global detector_manager
     
     if detector_manager is None:
         return
     
-    while True:
-        # Get the latest processed frame as JPEG
-        frame_bytes = detector_manager.get_frame_jpeg(detector_id)
-        
-        # Yield the frame in MJPEG format
-        yield (b'--frame\r\n'
-               b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
-        
-        # Control the frame rate of the stream
-        await asyncio.sleep(0.03)  # ~30 FPS
+    detector = detector_manager.get_detector(detector_id)
+    if detector is None:
+        # "No active detector" placeholder
+        while True:
+            frame_bytes = detector_manager.get_frame_jpeg(detector_id)
+            yield b''.join((PART_HEADER, frame_bytes, PART_TAIL))
+            await asyncio.sleep(FRAME_KEEPALIVE)
+    
+    broadcaster = _broadcasters.get(detector.detector_id)
+    if broadcaster is None:
+        broadcaster = _broadcasters[detector.detector_id] = FrameBroadcaster(detector)
+    queue = broadcaster.subscribe()
+    part = None
+    try:
+        while True:
+            try:
+                part = await asyncio.wait_for(queue.get(), timeout=FRAME_KEEPALIVE)
+            except asyncio.TimeoutError:
+                if part is None:
+                    continue
+            yield part
+    finally:
+        if broadcaster.unsubscribe(queue):
+            _broadcasters.pop(detector.detector_id, None)
@@ -1,53 +1,75 @@
 """Unified surveillance system launcher."""
 
 import asyncio
-import signal
 import subprocess
 import threading
-import time
-import sys
-import os
 import json
 from pathlib import Path
 from typing import List, Optional, Dict
 import typer
-import yaml
-from http.server import HTTPServer, BaseHTTPRequestHandler
 
-# Add the parent directory to sys.path to make videofeed importable
-parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-if parent_dir not in sys.path:
-    sys.path.insert(0, parent_dir)
-
-# Now import from videofeed
 from videofeed.credentials import get_credentials, load_config_credentials, reset_creds
 from videofeed.config import write_cfg, load_config_paths, SurveillanceConfig
-from videofeed.utils import detect_host_ip, check_mediamtx_installed, launch_mediamtx, print_urls
-from videofeed.visualizer import start_visualizer
+from videofeed.utils import OutputTail, detect_host_ip, check_mediamtx_installed, launch_mediamtx, print_urls, wait_for_port, wait_for_shutdown
 from videofeed.constants import DEFAULT_PATHS
 
 app = typer.Typer(add_completion=False)
 
-class PathsAPIHandler(BaseHTTPRequestHandler):
-    """Simple HTTP handler for paths API."""
+# Files shipped alongside the package
+PACKAGE_ROOT = Path(__file__).parent.parent
+DEFAULT_TLS_KEY = PACKAGE_ROOT / "server.key"
+DEFAULT_TLS_CERT = PACKAGE_ROOT / "server.crt"
+DEFAULT_CONFIG_FILE = PACKAGE_ROOT / "config" / "surveillance.yml"
+
+
+def add_paths_route(api, paths: List[str]) -> None:
+    """Register the /paths discovery endpoint on a FastAPI app.
     
-    def __init__(self, *args, paths=None, **kwargs):
-        self.paths = paths
-        super().__init__(*args, **kwargs)
+    Args:
+        api: FastAPI application to extend
+        paths: Camera stream paths to advertise
+    """
+    from fastapi.responses import Response
     
-    def do_GET(self):
-        """Handle GET requests."""
-        if self.path == "/paths":
-            self.send_response(200)
-            self.send_header("Content-Type", "application/json")
-            self.send_header("Access-Control-Allow-Origin", "*")
-            self.end_headers()
-            
-            data = {"count": len(self.paths), "paths": self.paths}
-            self.wfile.write(json.dumps(data).encode())
-        else:
-            self.send_response(404)
-            self.end_headers()
+    # Paths are fixed once the streaming server is up, so encode the body once
+    body = json.dumps({"count": len(paths), "paths": paths}).encode()
+    
+    @api.get("/paths")
+    async def get_paths():
+        return Response(
+            content=body,
+            media_type="application/json",
+            headers={"Access-Control-Allow-Origin": "*"}
+        )
+
+
+def create_paths_server(paths: List[str], port: int):
+    """Build the uvicorn server for the /paths discovery API.
+    
+    Args:
+        paths: Camera stream paths to advertise
+        port: Port to listen on (all interfaces)
+        
+    Returns:
+        uvicorn.Server: Server ready to ``run()`` or ``serve()``
+    """
+    # Imported here so CLI commands that never serve the API don't load them
+    import uvicorn
+    from fastapi import FastAPI
+    
+    api = FastAPI(docs_url=None, redoc_url=None, openapi_url=None)
+    add_paths_route(api, paths)
+    
+    # Served from the event loop (uvloop/httptools when installed)
+    config = uvicorn.Config(
+        app=api,
+        host="0.0.0.0",
+        port=port,
+        log_level="warning",
+        access_log=False,
+        timeout_graceful_shutdown=3
+    )
+    return uvicorn.Server(config)
 
 
 class SurveillanceSystem:
@@ -55,9 +77,8 @@ class SurveillanceSystem:
     
     def __init__(self):
         self.mediamtx_process = None
-        self.detector_thread = None
+        self.detector_server = None
         self.api_server = None
-        self.api_thread = None
         self.running = False
         self.config = {}
         
@@ -74,13 +95,10 @@ class SurveillanceSystem:
         check_mediamtx_installed("mediamtx")
         
         # Use default TLS paths if not provided
-        default_tls_key = Path(__file__).parent.parent / "server.key"
-        default_tls_cert = Path(__file__).parent.parent / "server.crt"
-        
-        if not tls_key and default_tls_key.exists():
-            tls_key = default_tls_key
-        if not tls_cert and default_tls_cert.exists():
-            tls_cert = default_tls_cert
+        if not tls_key and DEFAULT_TLS_KEY.exists():
+            tls_key = DEFAULT_TLS_KEY
+        if not tls_cert and DEFAULT_TLS_CERT.exists():
+            tls_cert = DEFAULT_TLS_CERT
             
         # Create configuration
         if config_path and config_path.exists():
@@ -102,32 +120,36 @@ class SurveillanceSystem:
             config_paths = paths
             
         # Launch MediaMTX
-        self.mediamtx_process = launch_mediamtx(config_path)
+        # Keep only the tail of MediaMTX's output, so startup errors can be
+        # shown without the per-client log growing for the life of the process
+        self.mediamtx_process = launch_mediamtx(config_path, log_file=subprocess.PIPE)
+        self.mediamtx_output = OutputTail(self.mediamtx_process.stdout)
         typer.echo("⏳ Starting streaming server...")
         
-        # Wait for server to start
-        import time
-        time.sleep(1)  # Give it a moment to start
+        # Detect the LAN address while MediaMTX boots, then wait until its RTSP
+        # listener is up (or the process dies)
+        host_ip = detect_host_ip()
+        probe_host = "127.0.0.1" if bind in ("0.0.0.0", "") else bind
+        wait_for_port(probe_host, 8554, timeout=5.0, process=self.mediamtx_process)
         
         # Check if process is still running
         if self.mediamtx_process.poll() is not None:
             # Process has terminated
-            stdout, stderr = self.mediamtx_process.communicate()
+            output = self.mediamtx_output.text()
             typer.secho("❌ MediaMTX failed to start!", fg=typer.colors.RED, bold=True)
-            if stdout:
-                typer.echo(f"STDOUT: {stdout.decode()}")
-            if stderr:
-                typer.echo(f"STDERR: {stderr.decode()}")
+            if output:
+                typer.echo(f"OUTPUT: {output}")
             raise typer.Exit(1)
             
         # Store configuration
         self.config = {
             "creds": creds,
             "paths": config_paths,
-            "host_ip": detect_host_ip(),
+            "host_ip": host_ip,
             "api_port": api_port,
             "use_rtsps": tls_key is not None and tls_cert is not None
         }
+        self.config["viewer_urls"] = self._build_viewer_urls()
         
         # Start API server if port is specified (silent)
         if api_port:
@@ -135,18 +157,18 @@ class SurveillanceSystem:
         
         return self.config
         
-    def start_api_server(self, port: int):
-        """Start the API server for path discovery."""
-        # Create a handler class with access to paths
-        paths = self.config["paths"]
-        
-        def handler_factory(*args, **kwargs):
-            return PathsAPIHandler(*args, paths=paths, **kwargs)
+    def _build_viewer_urls(self) -> List[str]:
+        """Build the credentialed viewer URL for each path (RTSPS when TLS is on)."""
+        creds = self.config["creds"]
+        if self.config["use_rtsps"]:
+            base = f"rtsps://{creds['read_user']}:{creds['read_pass']}@{self.config['host_ip']}:8322"
+        else:
+            base = f"rtsp://{creds['read_user']}:{creds['read_pass']}@{self.config['host_ip']}:8554"
+        return [f"{base}/{path}" for path in self.config["paths"]]
         
-        # Start the server in a separate thread
-        self.api_server = HTTPServer(("0.0.0.0", port), handler_factory)
-        self.api_thread = threading.Thread(target=self.api_server.serve_forever, daemon=True)
-        self.api_thread.start()
+    def start_api_server(self, port: int):
+        """Set up the API server for path discovery (run by serve())."""
+        self.api_server = create_paths_server(self.config["paths"], port)
         
         # API server starts silently - will be shown in final status
         # typer.echo(f"🔍 API server started on port {port}")
@@ -165,9 +187,13 @@ class SurveillanceSystem:
         recording_pre_buffer: int = 10,
         recording_post_buffer: int = 10,
         recordings_dir: Optional[str] = None,
-        record_objects: List[str] = []
+        record_objects: List[str] = [],
+        jpeg_quality: Optional[int] = None
     ):
-        """Start the object detection service in a separate thread."""
+        """Set up object detection and its dashboard server (run by serve()).
+        
+        ``jpeg_quality`` overrides the preview quality from surveillance.yml.
+        """
         # Store recording configuration for status display
         self.recording_enabled = enable_recording
         self.recording_config = {
@@ -178,175 +204,197 @@ class SurveillanceSystem:
             'record_objects': record_objects
         }
         
-        def run_detector():
-            # Build RTSP URLs from paths
-            rtsp_urls = []
-            for path in self.config["paths"]:
-                if self.config["use_rtsps"]:
-                    url = f"rtsps://{self.config['creds']['read_user']}:{self.config['creds']['read_pass']}@{self.config['host_ip']}:8322/{path}"
-                else:
-                    url = f"rtsp://{self.config['creds']['read_user']}:{self.config['creds']['read_pass']}@{self.config['host_ip']}:8554/{path}"
-                rtsp_urls.append(url)
-                
-            # Silent - will show in final status
-            # typer.echo(f"🎯 Starting object detection for {len(rtsp_urls)} streams...")
+        rtsp_urls = self.config["viewer_urls"]
+        
+        # Silent - will show in final status
+        # typer.echo(f"🎯 Starting object detection for {len(rtsp_urls)} streams...")
+        
+        # Import here to avoid circular imports
+        from videofeed.detector import DetectorManager
+        from videofeed.detector_config import DetectorConfig
+        from videofeed.visualizer import app, set_detector_manager
+        from videofeed.recorder import RecordingManager
+        import uvicorn
+        
+        try:
+            # Initialize recording manager if enabled
+            recording_manager = None
+            if enable_recording:
+                # Silent initialization - will show in final status
+                # typer.echo(f"📹 Initializing recording manager...")
+                recording_manager = RecordingManager(
+                    recordings_dir=recordings_dir,
+                    min_confidence=recording_min_confidence,
+                    pre_detection_buffer=recording_pre_buffer,
+                    post_detection_buffer=recording_post_buffer,
+                    record_objects=record_objects
+                )
+                recording_manager.start()
+                # typer.echo(f"📹 Recording enabled - clips will be saved to {recording_manager.recordings_dir}")
+            
+            # Initialize detector manager
+            detector_manager = DetectorManager(recording_manager=recording_manager)
             
-            # Import here to avoid circular imports
-            from videofeed.detector import DetectorManager
-            from videofeed.detector_config import DetectorConfig
-            from videofeed.visualizer import app, set_detector_manager
-            from videofeed.recorder import RecordingManager
-            import uvicorn
+            # Create detector configuration from surveillance config
+            # This pulls all settings from config/surveillance.yml including:
+            # - Model, confidence, resolution
+            # - Stream buffer and reconnect settings
+            # - Detection filters (classes, min/max area)
+            # - Visual appearance (box color, label style)
+            from videofeed.config import SurveillanceConfig
+            config_path = DEFAULT_CONFIG_FILE
+            surveillance_cfg = SurveillanceConfig(config_path)
+            detector_config = DetectorConfig.from_surveillance_config(surveillance_cfg)
+            if jpeg_quality is not None:
+                detector_config.jpeg_quality = jpeg_quality
             
-            try:
-                # Initialize recording manager if enabled
-                recording_manager = None
-                if enable_recording:
-                    # Silent initialization - will show in final status
-                    # typer.echo(f"📹 Initializing recording manager...")
-                    recording_manager = RecordingManager(
-                        recordings_dir=recordings_dir,
-                        min_confidence=recording_min_confidence,
-                        pre_detection_buffer=recording_pre_buffer,
-                        post_detection_buffer=recording_post_buffer,
-                        record_objects=record_objects
-                    )
-                    recording_manager.start()
-                    # typer.echo(f"📹 Recording enabled - clips will be saved to {recording_manager.recordings_dir}")
-                
-                # Initialize detector manager
-                detector_manager = DetectorManager(recording_manager=recording_manager)
-                
-                # Create detector configuration from surveillance config
-                # This pulls all settings from config/surveillance.yml including:
-                # - Model, confidence, resolution
-                # - Stream buffer and reconnect settings
-                # - Detection filters (classes, min/max area)
-                # - Visual appearance (box color, label style)
-                from videofeed.config import SurveillanceConfig
-                config_path = Path(__file__).parent.parent / "config" / "surveillance.yml"
-                surveillance_cfg = SurveillanceConfig(config_path)
-                detector_config = DetectorConfig.from_surveillance_config(surveillance_cfg)
-                
-                # Add detectors for each URL
-                for url in rtsp_urls:
-                    detector_manager.add_detector(
-                        source_url=url,
-                        config=detector_config,
-                        enable_recording=enable_recording
-                    )
-                
-                # Set the detector manager in the visualizer module
-                set_detector_manager(detector_manager)
-                
-                # Start FastAPI server without signal handlers
-                config = uvicorn.Config(
-                    app=app,
-                    host=host,
-                    port=port,
-                    log_level="info"
+            # Add detectors for each URL
+            for url in rtsp_urls:
+                detector_manager.add_detector(
+                    source_url=url,
+                    config=detector_config,
+                    enable_recording=enable_recording
                 )
-                
-                server = uvicorn.Server(config)
-                server.run()
-            except Exception as e:
-                typer.echo(f"Error in detector: {e}")
             
-        self.detector_thread = threading.Thread(target=run_detector, daemon=True)
-        self.detector_thread.start()
+            # Set the detector manager in the visualizer module
+            set_detector_manager(detector_manager)
+            
+            # Paths API on the dashboard port: serve it from the dashboard
+            # instead of opening a second listener
+            if self.config.get("api_port") == port:
+                add_paths_route(app, self.config["paths"])
+                self.api_server = None
+            
+            # Dashboard server; no per-request access log on the streaming endpoints.
+            # Open MJPEG and status streams never close on their own, so bound
+            # the shutdown drain instead of waiting for viewers to leave.
+            config = uvicorn.Config(
+                app=app,
+                host=host,
+                port=port,
+                log_level="warning",
+                access_log=False,
+                timeout_graceful_shutdown=3
+            )
+            
+            # Served by serve() on the main event loop
+            self.detector_server = uvicorn.Server(config)
+        except Exception as e:
+            typer.echo(f"Error in detector: {e}")
+        
+    def serve(self):
+        """Run the dashboard and paths API on one event loop until interrupted.
+        
+        Both uvicorn servers share the main thread's loop, so Ctrl+C reaches
+        them directly. The status is printed once they are accepting connections.
+        """
+        servers = [server for server in (self.detector_server, self.api_server) if server]
+        if not servers:
+            self.print_status()
+            wait_for_shutdown()
+            return
+        
+        async def main():
+            tasks = [asyncio.create_task(server.serve()) for server in servers]
+            while not all(server.started for server in servers):
+                if any(task.done() for task in tasks):
+                    break  # A server failed to start (e.g. port in use)
+                await asyncio.sleep(0.05)
+            self.print_status()
+            await asyncio.gather(*tasks)
+        
+        asyncio.run(main())
         
     def print_status(self):
-        """Print system status and connection information."""
-        typer.echo("\n" + "="*70)
-        typer.secho("🎥 SURVEILLANCE SYSTEM READY", fg=typer.colors.GREEN, bold=True)
-        typer.echo("="*70 + "\n")
+        """Print system status and connection information.
+        
+        The banner is assembled first and written with a single echo.
+        """
+        lines = []
+        lines.append("\n" + "="*70)
+        lines.append(typer.style("🎥 SURVEILLANCE SYSTEM READY", fg=typer.colors.GREEN, bold=True))
+        lines.append("="*70 + "\n")
         
         # Print active cameras
-        typer.secho("📹 ACTIVE CAMERAS", fg=typer.colors.YELLOW, bold=True)
+        lines.append(typer.style("📹 ACTIVE CAMERAS", fg=typer.colors.YELLOW, bold=True))
         for i, path in enumerate(self.config["paths"], 1):
             # Extract friendly name from path (e.g., "video/iphone" -> "iphone")
             camera_name = path.split('/')[-1]
-            typer.echo(f"  {i}. {camera_name} ({path})")
-        typer.echo()
+            lines.append(f"  {i}. {camera_name} ({path})")
+        lines.append("")
         
         # Print web dashboard (most important)
-        typer.secho("🌐 WEB DASHBOARD", fg=typer.colors.GREEN, bold=True)
-        typer.echo(f"  → http://{self.config['host_ip']}:8080")
-        typer.echo(f"     (Live view with AI detection)")
-        typer.echo()
+        lines.append(typer.style("🌐 WEB DASHBOARD", fg=typer.colors.GREEN, bold=True))
+        lines.append(f"  → http://{self.config['host_ip']}:8080")
+        lines.append(f"     (Live view with AI detection)")
+        lines.append("")
         
         # Print camera publishing info
-        typer.secho("📱 PUBLISH FROM CAMERA", fg=typer.colors.CYAN, bold=True)
-        typer.echo("  Use these credentials in your camera app (e.g., Larix Broadcaster):")
-        typer.echo()
+        lines.append(typer.style("📱 PUBLISH FROM CAMERA", fg=typer.colors.CYAN, bold=True))
+        lines.append("  Use these credentials in your camera app (e.g., Larix Broadcaster):")
+        lines.append("")
         protocol = "rtsps" if self.config["use_rtsps"] else "rtsp"
         port = "8322" if self.config["use_rtsps"] else "8554"
-        typer.echo(f"  Server:   {protocol}://{self.config['host_ip']}:{port}/[your-stream-path]")
-        typer.echo(f"  Username: {self.config['creds']['publish_user']}")
-        typer.echo(f"  Password: {self.config['creds']['publish_pass']}")
-        typer.echo()
-        typer.secho(f"  Example: {protocol}://{self.config['host_ip']}:{port}/{self.config['paths'][0]}", 
-                   fg=typer.colors.BRIGHT_BLACK)
-        typer.echo()
+        lines.append(f"  Server:   {protocol}://{self.config['host_ip']}:{port}/[your-stream-path]")
+        lines.append(f"  Username: {self.config['creds']['publish_user']}")
+        lines.append(f"  Password: {self.config['creds']['publish_pass']}")
+        lines.append("")
+        lines.append(typer.style(f"  Example: {protocol}://{self.config['host_ip']}:{port}/{self.config['paths'][0]}", fg=typer.colors.BRIGHT_BLACK))
+        lines.append("")
         
         # Print viewer credentials
-        typer.secho("👀 VIEW STREAMS (VLC, OBS, etc.)", fg=typer.colors.MAGENTA, bold=True)
-        typer.echo("  Use these credentials to view streams:")
-        typer.echo()
-        typer.echo(f"  Username: {self.config['creds']['read_user']}")
-        typer.echo(f"  Password: {self.config['creds']['read_pass']}")
-        typer.echo()
+        lines.append(typer.style("👀 VIEW STREAMS (VLC, OBS, etc.)", fg=typer.colors.MAGENTA, bold=True))
+        lines.append("  Use these credentials to view streams:")
+        lines.append("")
+        lines.append(f"  Username: {self.config['creds']['read_user']}")
+        lines.append(f"  Password: {self.config['creds']['read_pass']}")
+        lines.append("")
         # Show example for first camera
         if self.config["paths"]:
             camera_name = self.config["paths"][0].split('/')[-1]
-            if self.config["use_rtsps"]:
-                viewer_url = f"rtsps://{self.config['creds']['read_user']}:{self.config['creds']['read_pass']}@{self.config['host_ip']}:8322/{self.config['paths'][0]}"
-            else:
-                viewer_url = f"rtsp://{self.config['creds']['read_user']}:{self.config['creds']['read_pass']}@{self.config['host_ip']}:8554/{self.config['paths'][0]}"
-            typer.secho(f"  Example ({camera_name}): {viewer_url}", fg=typer.colors.BRIGHT_BLACK)
-        typer.echo()
+            viewer_url = self.config["viewer_urls"][0]
+            lines.append(typer.style(f"  Example ({camera_name}): {viewer_url}", fg=typer.colors.BRIGHT_BLACK))
+        lines.append("")
         
         # Print recording info if enabled
         if hasattr(self, 'recording_enabled') and self.recording_enabled:
-            typer.secho("📹 RECORDING", fg=typer.colors.BLUE, bold=True)
-            typer.echo(f"  Status:     ✓ Enabled")
-            typer.echo(f"  Directory:  {self.recording_config['recordings_dir']}")
-            typer.echo(f"  Buffer:     {self.recording_config['pre_buffer']}s before / {self.recording_config['post_buffer']}s after detection")
-            typer.echo(f"  Confidence: {self.recording_config['min_confidence']} minimum")
+            lines.append(typer.style("📹 RECORDING", fg=typer.colors.BLUE, bold=True))
+            lines.append(f"  Status:     ✓ Enabled")
+            lines.append(f"  Directory:  {self.recording_config['recordings_dir']}")
+            lines.append(f"  Buffer:     {self.recording_config['pre_buffer']}s before / {self.recording_config['post_buffer']}s after detection")
+            lines.append(f"  Confidence: {self.recording_config['min_confidence']} minimum")
             
             # Show object filtering
             if self.recording_config['record_objects']:
                 objects_str = ', '.join(self.recording_config['record_objects'])
-                typer.echo(f"  Objects:    {objects_str}")
+                lines.append(f"  Objects:    {objects_str}")
             else:
-                typer.echo(f"  Objects:    All detected objects")
-            typer.echo()
+                lines.append(f"  Objects:    All detected objects")
+            lines.append("")
         
         # Advanced URLs (collapsed)
-        typer.secho("🔗 ADVANCED", fg=typer.colors.BRIGHT_BLACK, bold=True)
+        lines.append(typer.style("🔗 ADVANCED", fg=typer.colors.BRIGHT_BLACK, bold=True))
         
         # All stream URLs with credentials
         if len(self.config["paths"]) > 1:
-            typer.echo(f"  All stream URLs:")
-            for path in self.config["paths"]:
+            lines.append(f"  All stream URLs:")
+            for path, url in zip(self.config["paths"], self.config["viewer_urls"]):
                 camera_name = path.split('/')[-1]
-                if self.config["use_rtsps"]:
-                    url = f"rtsps://{self.config['creds']['read_user']}:{self.config['creds']['read_pass']}@{self.config['host_ip']}:8322/{path}"
-                else:
-                    url = f"rtsp://{self.config['creds']['read_user']}:{self.config['creds']['read_pass']}@{self.config['host_ip']}:8554/{path}"
-                typer.echo(f"    • {camera_name}: {url}")
-            typer.echo()
+                lines.append(f"    • {camera_name}: {url}")
+            lines.append("")
         
         # HLS streaming
-        typer.echo(f"  HLS streaming: http://{self.config['host_ip']}:8888/[stream-path]/index.m3u8")
+        lines.append(f"  HLS streaming: http://{self.config['host_ip']}:8888/[stream-path]/index.m3u8")
         
         # API endpoint
         if self.config.get("api_port"):
-            typer.echo(f"  Paths API: http://{self.config['host_ip']}:{self.config['api_port']}/paths")
+            lines.append(f"  Paths API: http://{self.config['host_ip']}:{self.config['api_port']}/paths")
             
-        typer.echo("\n" + "="*70)
-        typer.secho("Press Ctrl+C to stop", fg=typer.colors.BRIGHT_BLACK)
-        typer.echo("="*70 + "\n")
+        lines.append("\n" + "="*70)
+        lines.append(typer.style("Press Ctrl+C to stop", fg=typer.colors.BRIGHT_BLACK))
+        lines.append("="*70 + "\n")
+        
+        typer.echo("\n".join(lines))
         
     def shutdown(self):
         """Shutdown all services."""
@@ -357,15 +405,15 @@ class SurveillanceSystem:
             self.mediamtx_process.wait()
             typer.echo("  ✓ Streaming server stopped")
             
-        # Detector thread will stop automatically as it's daemon
-        # We don't need to join it since it's a daemon thread
+        # The dashboard and API servers have already left serve()'s event loop;
+        # detector threads are daemons
         typer.echo("  ✓ Object detection stopped")
-        
-        # Shutdown API server if running
         if self.api_server:
-            self.api_server.shutdown()
             typer.echo("  ✓ API server stopped")
         
+        # Forget the cached LAN IP so a restart in this process re-detects it
+        detect_host_ip.cache_clear()
+        
         # Clean up temp directory if it exists
         if hasattr(self, 'temp_dir'):
             import shutil
@@ -382,7 +430,7 @@ def config(
     
     # Use default config path if not provided
     if config_file is None:
-        config_file = Path(__file__).parent.parent / "config" / "surveillance.yml"
+        config_file = DEFAULT_CONFIG_FILE
     
     # Load configuration using unified config manager
     config = SurveillanceConfig(config_file)
@@ -410,6 +458,7 @@ def config(
         recording_post_buffer=config.get_recording_post_buffer(),
         recordings_dir=config.get_recordings_directory(),
         record_objects=config.get_record_objects(),
+        jpeg_quality=None,  # start_detector reads it from surveillance.yml
     )
 
 
@@ -428,7 +477,7 @@ def start(
     confidence: float = typer.Option(0.4, "--confidence", help="Detection confidence"),
     width: int = typer.Option(960, "--width", help="Video width"),
     height: int = typer.Option(540, "--height", help="Video height"),
-    api_port: Optional[int] = typer.Option(3333, "--api-port", help="API port for paths"),
+    api_port: Optional[int] = typer.Option(3333, "--api-port", help="API port for paths (set to the detector port to serve /paths from the dashboard)"),
     tls_key: Optional[Path] = typer.Option(None, help="TLS key path"),
     tls_cert: Optional[Path] = typer.Option(None, help="TLS certificate path"),
     recording: bool = typer.Option(True, "--recording/--no-recording", help="Enable recording"),
@@ -437,6 +486,7 @@ def start(
     recording_post_buffer: int = typer.Option(10, "--post-buffer", help="Post-detection buffer seconds"),
     recordings_dir: Optional[str] = typer.Option(None, "--recordings-dir", help="Recordings directory"),
     record_objects: List[str] = typer.Option([], "--record-objects", help="List of object classes to record (empty means all)"),
+    jpeg_quality: Optional[int] = typer.Option(None, "--jpeg-quality", min=1, max=100, help="Dashboard preview JPEG quality (default: stream.jpeg_quality in surveillance.yml)"),
 ):
     """Start the unified surveillance system with streaming and object detection."""
     
@@ -459,7 +509,6 @@ def start(
         
         # Start detector if enabled
         if detector:
-            time.sleep(1)  # Give server a moment to stabilize
             system.start_detector(
                 host="0.0.0.0",
                 port=detector_port,
@@ -471,15 +520,12 @@ def start(
                 recording_pre_buffer=recording_pre_buffer,
                 recording_post_buffer=recording_post_buffer,
                 recordings_dir=recordings_dir,
-                record_objects=record_objects
+                record_objects=record_objects,
+                jpeg_quality=jpeg_quality
             )
-            time.sleep(2)  # Give detector time to initialize
             
-        # Print status
-        system.print_status()
-        
-        # Wait for interrupt
-        signal.pause()
+        # Serve until interrupted; prints the status once the servers are up
+        system.serve()
         
     except KeyboardInterrupt:
         pass
@@ -505,7 +551,8 @@ def quick(
         bind="0.0.0.0",
         detector=detector,
         detector_port=8080,
-        api_port=3333
+        api_port=3333,
+        jpeg_quality=None
     )
 
 
@@ -523,13 +570,10 @@ def run(
     check_mediamtx_installed("mediamtx")
 
     # Use default TLS paths if not provided
-    default_tls_key = Path(__file__).parent.parent / "server.key"
-    default_tls_cert = Path(__file__).parent.parent / "server.crt"
-
-    if not tls_key and default_tls_key.exists():
-        tls_key = default_tls_key
-    if not tls_cert and default_tls_cert.exists():
-        tls_cert = default_tls_cert
+    if not tls_key and DEFAULT_TLS_KEY.exists():
+        tls_key = DEFAULT_TLS_KEY
+    if not tls_cert and DEFAULT_TLS_CERT.exists():
+        tls_cert = DEFAULT_TLS_CERT
 
     tls_key_path = None
     tls_cert_path = None
@@ -575,43 +619,27 @@ def run(
 
         server = launch_mediamtx(cfg_path)
         typer.echo("⏳ Starting MediaMTX ...")
-        try:
-            server.wait(timeout=2)
-        except subprocess.TimeoutExpired:
-            pass  # Expected: server is running
-
+        
+        # Detect the LAN address while MediaMTX boots, then wait for its RTSP
+        # port (at most the 2 s this used to sleep, for configs on other ports)
         host_ip = detect_host_ip()
+        probe_host = "127.0.0.1" if bind in ("0.0.0.0", "") else bind
+        wait_for_port(probe_host, 8554, timeout=2.0, process=server)
         print_urls(host_ip, config_paths, creds, rtsps=use_rtsps)
 
         # JSON status API endpoint
         if api_port:
-            class StatusHandler(BaseHTTPRequestHandler):
-                def do_GET(self):
-                    if self.path == "/paths":
-                        data = {"count": len(config_paths), "paths": config_paths}
-                        resp = json.dumps(data)
-                        self.send_response(200)
-                        self.send_header("Content-Type", "application/json")
-                        self.send_header("Access-Control-Allow-Origin", "*")
-                        self.end_headers()
-                        self.wfile.write(resp.encode())
-                    else:
-                        self.send_response(404)
-                        self.end_headers()
-            api_server = HTTPServer(("0.0.0.0", api_port), StatusHandler)
-
-            threading.Thread(target=api_server.serve_forever, daemon=True).start()
+            api_server = create_paths_server(config_paths, api_port)
+            threading.Thread(target=api_server.run, daemon=True).start()
             typer.echo(f"\n 🔍 Paths API: Use this URL in the UI to auto-detect available paths \n")
             typer.echo(f"🖥️ If your UI is running on the same device as this server: http://127.0.0.1:{api_port}/paths")
             typer.echo(f"🌐 If your UI is running on a different device: http://{host_ip}:{api_port}/paths")
 
         typer.secho("Press Ctrl+C to quit.\n", fg=typer.colors.BRIGHT_BLACK)
-        try:
-            signal.pause()
-        except KeyboardInterrupt:
-            typer.echo("\nShutting down ...")
-            server.terminate()
-            server.wait()
+        wait_for_shutdown()
+        typer.echo("\nShutting down ...")
+        server.terminate()
+        server.wait()
 
 
 @app.command()
@@ -635,7 +663,8 @@ def detect(
     recordings_dir: Optional[Path] = typer.Option(None, "--recordings-dir", help="Directory to store recordings (default: ~/video-feed-recordings)"),
     min_confidence: float = typer.Option(0.5, "--min-record-confidence", help="Minimum confidence to trigger recording"),
     pre_buffer: int = typer.Option(5, "--pre-buffer", help="Seconds of video to keep before detection"),
-    post_buffer: int = typer.Option(5, "--post-buffer", help="Seconds of video to keep after last detection")
+    post_buffer: int = typer.Option(5, "--post-buffer", help="Seconds of video to keep after last detection"),
+    jpeg_quality: int = typer.Option(80, "--jpeg-quality", min=1, max=100, help="Dashboard preview JPEG quality (lower = less bandwidth)")
 ) -> None:
     """Start object detection visualizer with multiple RTSP streams."""
     # Check if either rtsp_urls or paths are provided
@@ -676,7 +705,8 @@ def detect(
             
         typer.secho("Press Ctrl+C once to exit cleanly.", fg=typer.colors.BRIGHT_BLACK)
         
-        # Start the visualizer with all URLs
+        # Start the visualizer with all URLs (imported here: it pulls in torch)
+        from videofeed.visualizer import start_visualizer
         start_visualizer(
             rtsp_urls=all_urls,
             host=host,
@@ -688,7 +718,8 @@ def detect(
             recordings_dir=str(recordings_dir) if recordings_dir else None,
             min_confidence=min_confidence,
             pre_detection_buffer=pre_buffer,
-            post_detection_buffer=post_buffer
+            post_detection_buffer=post_buffer,
+            jpeg_quality=jpeg_quality
         )
         
         # Display recording info if enabled
@@ -1,18 +1,30 @@
 """Utility functions for video-feed."""
 
+import signal
 import socket
 import shutil
 import subprocess
+import threading
+import time
 import typer
+from collections import deque
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import BinaryIO, Dict, List, Optional, Union
 
 from .constants import MEDIAMTX_BIN
 
+# Models bundled with the package
+PACKAGE_MODELS_DIR = Path(__file__).parent.parent / "models"
 
+
+@lru_cache(maxsize=32)
 def resolve_model_path(model_name: str) -> str:
     """Resolve YOLO model path to use package models directory.
     
+    Results are cached, so adding many streams with the same model stats
+    the filesystem once.
+    
     Args:
         model_name: Model filename (e.g., 'yolov8n.pt') or full path
         
@@ -26,8 +38,7 @@ def resolve_model_path(model_name: str) -> str:
         return str(model_path)
     
     # Check in package models directory
-    package_models_dir = Path(__file__).parent.parent / "models"
-    package_model_path = package_models_dir / model_name
+    package_model_path = PACKAGE_MODELS_DIR / model_name
     
     if package_model_path.exists():
         return str(package_model_path)
@@ -36,11 +47,16 @@ def resolve_model_path(model_name: str) -> str:
     return model_name
 
 
-def launch_mediamtx(cfg_path: Path) -> subprocess.Popen:
+def launch_mediamtx(cfg_path: Path, log_file: Optional[Union[BinaryIO, int]] = None) -> subprocess.Popen:
     """Launch the MediaMTX server with the given configuration.
     
+    Output goes to ``log_file`` or is discarded. With ``subprocess.PIPE`` the
+    caller must keep draining it (see OutputTail); a pipe nobody reads stalls
+    MediaMTX once the pipe buffer fills.
+    
     Args:
         cfg_path: Path to mediamtx.yml configuration file
+        log_file: Binary file or ``subprocess.PIPE`` receiving stdout and stderr (optional)
         
     Returns:
         Process object for the running server
@@ -55,13 +71,93 @@ def launch_mediamtx(cfg_path: Path) -> subprocess.Popen:
     
     return subprocess.Popen(
         [MEDIAMTX_BIN, str(cfg_path)],
-        stdout=subprocess.PIPE, 
-        stderr=subprocess.PIPE
+        stdout=log_file if log_file is not None else subprocess.DEVNULL,
+        stderr=subprocess.STDOUT if log_file is not None else subprocess.DEVNULL
     )
 
 
+class OutputTail:
+    """Drain a process's output on a daemon thread, keeping only the last lines.
+    
+    Memory stays bounded however long the process runs and logs, while the
+    tail is still available to report why it exited.
+    """
+    
+    def __init__(self, stream: BinaryIO, max_lines: int = 200):
+        """Start reading.
+        
+        Args:
+            stream: Binary output stream of the process (e.g. ``process.stdout``)
+            max_lines: Number of most recent lines to keep
+        """
+        self.lines = deque(maxlen=max_lines)
+        self._thread = threading.Thread(target=self._read, args=(stream,), daemon=True)
+        self._thread.start()
+        
+    def _read(self, stream: BinaryIO) -> None:
+        with stream:
+            for line in iter(stream.readline, b""):
+                self.lines.append(line)
+                
+    def text(self, timeout: float = 1.0) -> str:
+        """Return the kept output, first waiting up to ``timeout`` for EOF."""
+        self._thread.join(timeout)
+        return b"".join(self.lines).decode(errors="replace")
+
+
+def wait_for_port(host: str, port: int, timeout: float = 5.0,
+                  process: Optional[subprocess.Popen] = None) -> bool:
+    """Wait until a TCP port accepts connections.
+    
+    Args:
+        host: Host to connect to
+        port: Port to probe
+        timeout: Seconds to keep trying
+        process: Stop early if this process exits
+        
+    Returns:
+        True once the port is accepting, False on timeout or process exit
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            return False
+        try:
+            with socket.create_connection((host, port), timeout=0.1):
+                return True
+        except OSError:
+            time.sleep(0.02)
+    return False
+
+
+def wait_for_shutdown() -> None:
+    """Block the main thread until SIGINT or SIGTERM arrives.
+    
+    Portable replacement for ``signal.pause()``, which doesn't exist on
+    Windows. The previous handlers are restored before returning.
+    """
+    stop = threading.Event()
+    
+    def handle(signum, frame):
+        stop.set()
+    
+    previous = {sig: signal.signal(sig, handle) for sig in (signal.SIGINT, signal.SIGTERM)}
+    try:
+        # Timed waits keep Ctrl+C responsive on Windows
+        while not stop.wait(0.5):
+            pass
+    finally:
+        for sig, handler in previous.items():
+            signal.signal(sig, handler)
+
+
+@lru_cache(maxsize=4)
 def detect_host_ip(prefer_iface: Optional[str] = None) -> str:
-    """Return best-guess LAN IP, fallback to localhost."""
+    """Return best-guess LAN IP, fallback to localhost.
+    
+    The result is cached for the session; ``detect_host_ip.cache_clear()``
+    forces a fresh lookup.
+    """
     try:
         with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
             s.connect(("8.8.8.8", 80))
@@ -70,63 +166,80 @@ def detect_host_ip(prefer_iface: Optional[str] = None) -> str:
         return "127.0.0.1"
 
 
+@lru_cache(maxsize=None)
+def _which(binary: str) -> Optional[str]:
+    """Cached ``shutil.which``; the PATH walk is done once per binary."""
+    return shutil.which(binary)
+
+
 def check_mediamtx_installed(binary_name: str = MEDIAMTX_BIN) -> None:
     """Check if mediamtx binary is available and exit if not."""
-    if shutil.which(binary_name) is None:
+    if _which(binary_name) is None:
         typer.secho(f"Error: '{binary_name}' binary not found.", fg=typer.colors.RED, bold=True)
         typer.echo("Please install MediaMTX from: https://github.com/bluenviron/mediamtx/releases")
         raise typer.Exit(1)
 
 
 def print_urls(host: str, paths: List[str], creds: Dict[str, str], rtsps: bool = False) -> None:
-    """Print connection URLs for RTSP/HLS streams."""
+    """Print connection URLs for RTSP/HLS streams.
+    
+    The whole listing is built first and written with a single echo.
+    """
+    def heading(text: str, color: str) -> str:
+        return typer.style(text, fg=color, bold=True)
+    
+    lines = []
     for i, path in enumerate(paths):
         if i > 0:
-            typer.echo("\n" + "-" * 50 + "\n")
+            lines.append("\n" + "-" * 50 + "\n")
             
-        typer.secho(f"\n📹 Stream Path: {path}", fg=typer.colors.YELLOW, bold=True)
+        lines.append(heading(f"\n📹 Stream Path: {path}", typer.colors.YELLOW))
         base_url = f"rtsp://{host}:8554/{path}"
 
         if rtsps:
             # For secure publishers like Larix
             publish_url = f"rtsps://{host}:8322/{path}"
-            typer.secho("\n📲 Encrypted RTSPS Publishing:", fg=typer.colors.CYAN, bold=True)
-            typer.secho("Use in phone apps (e.g. Larix Broadcaster) or other cameras - encrypted", fg=typer.colors.CYAN, bold=True)
-            typer.echo(f"  URL: {publish_url}")
-            typer.echo(f"  User: {creds['publish_user']}")
-            typer.echo(f"  Pass: {creds['publish_pass']}") 
+            lines.append(heading("\n📲 Encrypted RTSPS Publishing:", typer.colors.CYAN))
+            lines.append(heading("Use in phone apps (e.g. Larix Broadcaster) or other cameras - encrypted", typer.colors.CYAN))
+            lines.append(f"  URL: {publish_url}")
+            lines.append(f"  User: {creds['publish_user']}")
+            lines.append(f"  Pass: {creds['publish_pass']}")
         else:
             # Standard RTSP publishing
-            typer.secho("\n📲 RTSP Publishing:", fg=typer.colors.CYAN, bold=True)
-            typer.secho("Use in phone apps (e.g. Larix Broadcaster) or other cameras - unencrypted", fg=typer.colors.CYAN, bold=True)
-            typer.echo(f"  URL: {base_url}")
-            typer.echo(f"  User: {creds['publish_user']}")
-            typer.echo(f"  Pass: {creds['publish_pass']}")
+            lines.append(heading("\n📲 RTSP Publishing:", typer.colors.CYAN))
+            lines.append(heading("Use in phone apps (e.g. Larix Broadcaster) or other cameras - unencrypted", typer.colors.CYAN))
+            lines.append(f"  URL: {base_url}")
+            lines.append(f"  User: {creds['publish_user']}")
+            lines.append(f"  Pass: {creds['publish_pass']}")
 
         # Show viewing URLs - always the same regardless of rtsps/rtsp for publishing
-        typer.secho("\n📺 Encrypted RTSPS Viewing:", fg=typer.colors.GREEN, bold=True)
-        typer.secho("Use in OBS or other video platform- encrypted", fg=typer.colors.GREEN, bold=True)
+        lines.append(heading("\n📺 Encrypted RTSPS Viewing:", typer.colors.GREEN))
+        lines.append(heading("Use in OBS or other video platform- encrypted", typer.colors.GREEN))
         view_url = f"rtsps://{creds['read_user']}:{creds['read_pass']}@{host}:8322/{path}"
-        typer.echo(f"  URL: {view_url}")
-        typer.echo(f"  • VLC: File > Open Network > {view_url}")
-        typer.echo(f"  • OBS: Souces > + > Media Source > Uncheck local File > add RTSP URL to input >\n {view_url}")
+        lines.append(f"  URL: {view_url}")
+        lines.append(f"  • VLC: File > Open Network > {view_url}")
+        lines.append(f"  • OBS: Souces > + > Media Source > Uncheck local File > add RTSP URL to input >\n {view_url}")
 
-        typer.secho("\n🌐 HLS Viewing (browser):", fg=typer.colors.MAGENTA, bold=True)
-        typer.secho("Use in OBS or other video platform- encrypted", fg=typer.colors.MAGENTA, bold=True)
+        lines.append(heading("\n🌐 HLS Viewing (browser):", typer.colors.MAGENTA))
+        lines.append(heading("Use in OBS or other video platform- encrypted", typer.colors.MAGENTA))
         hls_url = f"http://{host}:8888/{path}/index.m3u8"
         hls_auth_url = f"http://{creds['read_user']}:{creds['read_pass']}@{host}:8888/{path}/index.m3u8"
-        typer.echo(f"  URL: {hls_url}")
-        typer.echo(f"  Auth: {creds['read_user']} / {creds['read_pass']}")
-        typer.echo(f"  Direct URL: {hls_auth_url}")
+        lines.append(f"  URL: {hls_url}")
+        lines.append(f"  Auth: {creds['read_user']} / {creds['read_pass']}")
+        lines.append(f"  Direct URL: {hls_auth_url}")
 
         # Unencrypted RTSP Connection Settings
-        typer.secho("\n🎥 Unencrypted RTSP Connection Settings:", fg=typer.colors.GREEN, bold=True)
-        typer.secho("Use in phone apps (e.g. Larix Broadcaster) or other cameras - unencrypted", fg=typer.colors.GREEN, bold=True)
-        typer.echo(f"   URL: {base_url}")
-        typer.echo(f"   Username: {creds['publish_user']}")
-        typer.echo(f"   Password: {creds['publish_pass']}")
+        lines.append(heading("\n🎥 Unencrypted RTSP Connection Settings:", typer.colors.GREEN))
+        lines.append(heading("Use in phone apps (e.g. Larix Broadcaster) or other cameras - unencrypted", typer.colors.GREEN))
+        lines.append(f"   URL: {base_url}")
+        lines.append(f"   Username: {creds['publish_user']}")
+        lines.append(f"   Password: {creds['publish_pass']}")
 
         # Viewer URL (embedded credentials)
-        typer.secho("\n👀 Viewer URL (embedded credentials):", fg=typer.colors.BLUE, bold=True)
-        typer.secho("Use in OBS or other video platform- unencrypted", fg=typer.colors.BLUE, bold=True)
-        typer.echo(f"   {view_url}")
+        lines.append(heading("\n👀 Viewer URL (embedded credentials):", typer.colors.BLUE))
+        lines.append(heading("Use in OBS or other video platform- unencrypted", typer.colors.BLUE))
+        lines.append(f"   {view_url}")
+    
+    # typer.echo strips the styling when stdout isn't a terminal
+    if lines:
+        typer.echo("\n".join(lines))
@@ -1,17 +1,25 @@
 """API server for video-feed with object detection."""
 
+import asyncio
+import hashlib
+import json
 import logging
 import os
-import signal
-import threading
 import time
-from typing import List, Optional
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse, Response, StreamingResponse
 import uvicorn
 
-from videofeed.detector import DetectorManager
+# Optional faster JSON encoder for API responses
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from videofeed.recorder import RecordingManager
 from videofeed.api import RecordingsAPI
 from videofeed.utils import detect_host_ip
@@ -26,6 +34,7 @@ from videofeed.routes import (
     auth_router
 )
 import videofeed.routes.video as video_routes
+import videofeed.routes.pages as pages_routes
 import videofeed.routes.files as files_routes
 import videofeed.routes.recordings as recordings_routes
 import videofeed.routes.statistics as statistics_routes
@@ -36,23 +45,30 @@ logging.basicConfig(level=logging.INFO,
 logger = logging.getLogger('video-api-server')
 
 # Create FastAPI app
-app = FastAPI(title="Video Feed API")
-
-# Get host IP for CORS configuration
-host_ip = detect_host_ip()
+app = FastAPI(
+    title="Video Feed API",
+    default_response_class=ORJSONResponse if orjson is not None else JSONResponse
+)
 
-# Configure CORS middleware with restricted origins
-allowed_origins = [
-    "http://localhost:8080",
-    "http://127.0.0.1:8080",
-    f"http://{host_ip}:8080",
-    "http://localhost:3000",  # If you have a separate frontend
-    "http://127.0.0.1:3000",
-]
+# Configure CORS middleware with restricted origins. VIDEOFEED_ALLOWED_ORIGINS
+# (comma-separated) replaces the defaults and skips the LAN IP probe they need.
+_origins_env = os.environ.get("VIDEOFEED_ALLOWED_ORIGINS", "")
+if _origins_env.strip():
+    allowed_origins = frozenset(o.strip() for o in _origins_env.split(",") if o.strip())
+else:
+    # Get host IP for CORS configuration (cached, so free after the CLI's lookup)
+    host_ip = detect_host_ip()
+    allowed_origins = frozenset((
+        "http://localhost:8080",
+        "http://127.0.0.1:8080",
+        f"http://{host_ip}:8080",
+        "http://localhost:3000",  # If you have a separate frontend
+        "http://127.0.0.1:3000",
+    ))
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=allowed_origins,  # ✅ Restricted to specific origins
+    allow_origins=allowed_origins,  # ✅ Restricted to specific origins; set for O(1) lookup
     allow_credentials=True,
     allow_methods=["GET", "POST", "DELETE", "PUT"],  # ✅ Specific methods only
     allow_headers=["Content-Type", "Authorization", "Cookie"],  # ✅ Specific headers
@@ -83,9 +99,13 @@ def set_detector_manager(manager):
     """
     global detector_manager
     detector_manager = manager
+    _feeds_body.cache_clear()
+    _status_cache.clear()
+    _status_event.cache_clear()
     
     # Also set in route modules that need it
     video_routes.set_detector_manager(manager)
+    pages_routes.set_detector_manager(manager)
     statistics_routes.set_detector_manager(manager)
     
     # Detector manager set silently
@@ -93,36 +113,125 @@ def set_detector_manager(manager):
     return detector_manager
 
 
+# Status is rebuilt at most this often, however many tabs are watching
+STATUS_INTERVAL = 2.0
+# Feed ID (None for all) -> (monotonic build time, serialized status, ETag)
+_status_cache: Dict[Optional[str], Tuple[float, bytes, str]] = {}
+
+
+def _dumps(payload) -> bytes:
+    """Serialize a response payload, with orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, default=float).encode()
+
+
+def _status_body(feed: Optional[str] = None) -> Tuple[bytes, str]:
+    """Serialized status of one or all detectors, shared by every poller and stream.
+    
+    Only known feeds are cached, so arbitrary query values can't grow the cache.
+    
+    Returns:
+        Tuple of (JSON body, weak ETag of its content)
+    """
+    built, body, etag = _status_cache.get(feed, (float("-inf"), b"", ""))
+    now = time.monotonic()
+    if now - built >= STATUS_INTERVAL:
+        status = detector_manager.get_detector_status(feed)
+        body = _dumps(status)
+        etag = f'W/"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+        if feed is None or detector_manager.get_detector(feed) is not None:
+            _status_cache[feed] = (now, body, etag)
+    return body, etag
+
+
 @app.get("/status")
-async def get_status(feed: Optional[str] = None):
-    """Get the detector status for one or all feeds."""
+async def get_status(request: Request, feed: Optional[str] = None):
+    """Get the detector status for one or all feeds.
+    
+    Pollers that send back the ETag get an empty 304 while nothing changed.
+    """
     global detector_manager
     if detector_manager is None:
         raise HTTPException(status_code=503, detail="Detector manager not initialized")
     
-    return detector_manager.get_detector_status(feed)
+    body, etag = _status_body(feed)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
-@app.get("/feeds")
-async def get_feeds():
-    """Get information about all available feeds."""
+@lru_cache(maxsize=1)
+def _status_event(body: bytes) -> bytes:
+    """Server-sent event carrying a status snapshot as indented JSON.
+    
+    Indenting once here, for every open dashboard, lets the browser show the
+    event data as-is instead of re-stringifying it.
+    """
+    if orjson is not None:
+        pretty = orjson.dumps(orjson.loads(body), option=orjson.OPT_INDENT_2)
+    else:
+        pretty = json.dumps(json.loads(body), indent=2).encode()
+    # One data field per line; EventSource joins them back with newlines
+    return b"".join(b"data: " + line + b"\n" for line in pretty.splitlines()) + b"\n"
+
+
+async def _status_events():
+    """Yield the shared status snapshot as server-sent events when it changes."""
+    last = None
+    while detector_manager is not None:
+        body, _ = _status_body()
+        if body != last:
+            last = body
+            yield _status_event(body)
+        await asyncio.sleep(STATUS_INTERVAL)
+
+
+@app.get("/status/stream")
+async def status_stream():
+    """Push status of all detectors to the dashboard as server-sent events."""
     global detector_manager
     if detector_manager is None:
         raise HTTPException(status_code=503, detail="Detector manager not initialized")
     
+    return StreamingResponse(
+        _status_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+
+@lru_cache(maxsize=1)
+def _feeds_body(version: int) -> Tuple[bytes, str]:
+    """Serialized /feeds payload and its ETag, rebuilt only when the detector set changes."""
     feeds = {}
     for detector_id, detector in detector_manager.get_all_detectors().items():
         feeds[detector_id] = {
             "id": detector_id,
             "name": detector.get_name(),
-            "source": detector._mask_credentials(detector.source_url)
+            "source": detector.masked_url,
+            "secure": detector.secure
         }
     
-    return {"feeds": feeds, "default": detector_manager.default_detector_id}
+    payload = {"feeds": feeds, "default": detector_manager.default_detector_id}
+    body = _dumps(payload)
+    # Content hash: detector IDs differ between runs, versions do not
+    return body, f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
 
 
-# Create a shutdown event to coordinate graceful shutdown
-shutdown_requested = threading.Event()
+@app.get("/feeds")
+async def get_feeds(request: Request):
+    """Get information about all available feeds."""
+    global detector_manager
+    if detector_manager is None:
+        raise HTTPException(status_code=503, detail="Detector manager not initialized")
+    
+    body, etag = _feeds_body(detector_manager.version)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @app.on_event("shutdown")
@@ -136,11 +245,6 @@ async def shutdown_detector():
         logger.info("All detectors stopped successfully")
     logger.info("Detector stopped successfully")
 
-def force_exit():
-    """Force exit after a timeout."""
-    time.sleep(3)  # Give a few seconds for graceful shutdown
-    logger.warning("Forcing exit after timeout")
-    os._exit(0)  # Hard exit
 
 def start_visualizer(
     rtsp_urls: List[str],
@@ -153,7 +257,8 @@ def start_visualizer(
     recordings_dir: Optional[str] = None,
     min_confidence: float = 0.5,
     pre_detection_buffer: int = 5,
-    post_detection_buffer: int = 5
+    post_detection_buffer: int = 5,
+    jpeg_quality: int = 80
 ):
     """Start the API server with object detection for multiple streams.
     
@@ -169,6 +274,7 @@ def start_visualizer(
         min_confidence: Minimum confidence for recording
         pre_detection_buffer: Seconds to buffer before detection
         post_detection_buffer: Seconds to buffer after detection
+        jpeg_quality: Dashboard preview JPEG quality (1-100)
     """
     global detector_manager, recordings_api, recordings_directory
     
@@ -212,43 +318,31 @@ def start_visualizer(
         recordings_routes.set_recordings_api(recordings_api)
         statistics_routes.set_recordings_api(recordings_api)
     
-    # Initialize the detector manager
+    # Initialize the detector manager. Imported here so that importing the
+    # app for its routes does not load torch and Ultralytics.
+    from videofeed.detector import DetectorManager
+    from videofeed.detector_config import DetectorConfig
     detector_manager = DetectorManager(recording_manager=recording_manager)
     set_detector_manager(detector_manager)
     logger.info(f"Initializing detection for {len(rtsp_urls)} streams")
     
-    # Define our own signal handler for graceful shutdown
-    def handle_exit(signum, frame):
-        logger.info(f"Received signal {signum}, initiating graceful shutdown")
-        shutdown_requested.set()
-        
-        # Stop all detectors BEFORE shutting down uvicorn
-        if detector_manager:
-            logger.info("Stopping all detectors...")
-            detector_manager.stop_all()
-            logger.info("All detectors stopped successfully")
-        
-        # Start a watchdog thread to force exit if graceful shutdown takes too long
-        exit_thread = threading.Thread(target=force_exit, daemon=True)
-        exit_thread.start()
-    
-    # Register our custom signal handlers
-    original_sigint = signal.getsignal(signal.SIGINT)
-    original_sigterm = signal.getsignal(signal.SIGTERM)
-    signal.signal(signal.SIGINT, handle_exit)
-    signal.signal(signal.SIGTERM, handle_exit)
-    
     try:
-        # Load model once and add all detectors
+        # One config for all streams, so the manager loads (and, with
+        # engine: tensorrt, exports) the model once and shares its worker
+        detector_config = DetectorConfig(
+            model_path=model_path,
+            confidence=confidence,
+            resolution=resolution,
+            jpeg_quality=jpeg_quality
+        )
         logger.info(f"Loading YOLO model: {model_path}")
         for url in rtsp_urls:
             # Add detector to manager
             logger.info(f"Starting detector for stream: {url.split('@')[-1] if '@' in url else url}")
             detector_manager.add_detector(
                 source_url=url,
-                model_path=model_path,
-                confidence=confidence,
-                resolution=resolution
+                config=detector_config,
+                enable_recording=enable_recording
             )
         
         # Config for Uvicorn with shutdown timeout
@@ -257,11 +351,14 @@ def start_visualizer(
             host=host,
             port=port,
             log_level="info",
+            access_log=False,        # No log line per MJPEG/thumbnail request
             timeout_keep_alive=2,    # Shorter keep-alive timeout 
             timeout_graceful_shutdown=3  # Shorter graceful shutdown timeout
         )
         
-        # Start Uvicorn server
+        # Start Uvicorn server. It handles SIGINT/SIGTERM itself: it stops
+        # accepting connections, runs the shutdown hook (which stops the
+        # detectors) and bounds the drain with timeout_graceful_shutdown.
         server = uvicorn.Server(config)
         logger.info(f"Starting API server with {len(rtsp_urls)} streams at http://{host}:{port}")
         logger.info("Press Ctrl+C once to exit cleanly.")
@@ -271,10 +368,6 @@ def start_visualizer(
     except Exception as e:
         logger.error(f"Error in API server: {e}")
     finally:
-        # Restore original signal handlers
-        signal.signal(signal.SIGINT, original_sigint)
-        signal.signal(signal.SIGTERM, original_sigterm)
-        
         # Make sure all detectors are stopped
         if detector_manager:
             logger.info("Final cleanup of all detectors...")